@@ -83,14 +83,8 @@ def deduct_credits(user_id: str, credits_spent: float):
 
     new_remaining = txn(db.transaction())
     
-    # ✅ AUTO-PAUSE COMPOSIO IF CREDITS EXHAUSTED
     if new_remaining <= 0:
-        try:
-            from services.composio.composio_manager import pause_composio_trigger
-            pause_composio_trigger(user_id)
-            print(f"🔴 User {user_id} exhausted credits - Composio paused")
-        except Exception as e:
-            print(f"⚠️ Failed to pause Composio: {e}")
+        print(f"🔴 User {user_id} exhausted credits")
 
 
 def has_enough_credits(user_id: str) -> bool:
@@ -6,7 +6,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from datetime import datetime, timezone, timedelta
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 import os
+import logging
 import requests
 import base64
 import json
@@ -24,11 +26,18 @@ from services.composio.connection_state_manager import (
     should_run_initial_sync,
     mark_first_connection,
     mark_reconnection,
-    mark_disconnection
+    mark_disconnection,
+    flush_connection_writes,
+    discard_connection_writes
 )
 
 load_dotenv()
 
+# Root stays at WARNING so third-party libraries (httpx, openai, urllib3) stay quiet;
+# our own modules under services/ log at INFO
+logging.basicConfig()
+logging.getLogger("services").setLevel(logging.INFO)
+
 if not firebase_admin._apps:
     service_account_b64 = os.getenv("FIREBASE_SERVICE_ACCOUNT_BASE64")
     
@@ -175,6 +184,69 @@ def check_triggers_exist(composio: Composio, user_id: str, connection_id: str) -
         return (False, None, False, None)
 
 
+# ======================================================
+# HELPER: CREATE BOTH GMAIL TRIGGERS
+# ======================================================
+def _create_trigger(composio: Composio, user_id: str, connection_id: str, slug: str, trigger_config: dict) -> str:
+    """Create one Composio trigger and return its ID."""
+    trigger = composio.triggers.create(
+        slug=slug,
+        user_id=user_id,
+        connected_account_id=connection_id,
+        trigger_config=trigger_config
+    )
+    return getattr(trigger, "id", None) or getattr(trigger, "trigger_id", None)
+
+
+def create_gmail_triggers(composio: Composio, user_id: str, connection_id: str) -> tuple[str, str]:
+    """
+    Create the INBOX and SENT triggers in parallel.
+    Returns: (inbox_trigger_id, sent_trigger_id)
+    
+    The two Composio calls are independent, so total latency is the
+    slower of the two instead of their sum.
+    """
+    print("📬📤 Creating INBOX + SENT triggers...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        inbox_future = executor.submit(
+            _create_trigger, composio, user_id, connection_id,
+            "GMAIL_NEW_GMAIL_MESSAGE", {}
+        )
+        sent_future = executor.submit(
+            _create_trigger, composio, user_id, connection_id,
+            "GMAIL_EMAIL_SENT_TRIGGER", {
+                "interval": 1,  # Check every 1 minute
+                "userId": "me"
+            }
+        )
+        outcomes = {}
+        for name, future in (("INBOX", inbox_future), ("SENT", sent_future)):
+            try:
+                outcomes[name] = (future.result(), None)
+            except Exception as e:
+                outcomes[name] = (None, e)
+    
+    # Partial failure: delete the trigger that did get created so it isn't
+    # left polling on Composio with its ID unrecorded
+    errors = [e for _, e in outcomes.values() if e is not None]
+    if errors:
+        for name, (trigger_id, _) in outcomes.items():
+            if trigger_id:
+                try:
+                    composio.triggers.delete(trigger_id=trigger_id)
+                    print(f"🧹 Deleted orphaned {name} trigger: {trigger_id}")
+                except Exception as e:
+                    print(f"⚠️ Failed to delete orphaned {name} trigger {trigger_id}: {e}")
+        raise errors[0]
+    
+    inbox_trigger_id = outcomes["INBOX"][0]
+    sent_trigger_id = outcomes["SENT"][0]
+    
+    print(f"✅ INBOX trigger created: {inbox_trigger_id}")
+    print(f"✅ SENT trigger created: {sent_trigger_id}\n")
+    return inbox_trigger_id, sent_trigger_id
+
+
 # ======================================================
 # HELPER: GET EXISTING GMAIL CONNECTION
 # ======================================================
@@ -367,52 +439,31 @@ def run_initial_sync_and_trigger_first_time(user_id: str, connection_id: str, gm
             import traceback
             traceback.print_exc()
 
-        # Create INBOX trigger
-        print("📬 Creating INBOX trigger...")
+        # Create INBOX + SENT triggers (PHASE 4B) concurrently
         composio = Composio(api_key=COMPOSIO_API_KEY)
-        
-        inbox_trigger = composio.triggers.create(
-            slug="GMAIL_NEW_GMAIL_MESSAGE",
-            user_id=user_id,
-            connected_account_id=connection_id,
-            trigger_config={}
-        )
-        inbox_trigger_id = getattr(inbox_trigger, "id", None) or getattr(inbox_trigger, "trigger_id", None)
-        print(f"✅ INBOX trigger created: {inbox_trigger_id}\n")
+        inbox_trigger_id, sent_trigger_id = create_gmail_triggers(composio, user_id, connection_id)
 
-        # PHASE 4B: Create SENT trigger
-        print("📤 Creating SENT trigger...")
-        sent_trigger = composio.triggers.create(
-            slug="GMAIL_EMAIL_SENT_TRIGGER",
-            user_id=user_id,
-            connected_account_id=connection_id,
-            trigger_config={
-                "interval": 1,  # Check every 1 minute
-                "userId": "me"
-            }
-        )
-        sent_trigger_id = getattr(sent_trigger, "id", None) or getattr(sent_trigger, "trigger_id", None)
-        print(f"✅ SENT trigger created: {sent_trigger_id}\n")
-
-        # Mark first connection with BOTH triggers
+        # Mark first connection with BOTH triggers (queued, written with the sync status below)
         mark_first_connection(
             user_id=user_id,
             entity_id=connection_id,
             inbox_trigger_id=inbox_trigger_id,
-            sent_trigger_id=sent_trigger_id  # PHASE 4B: NEW
+            sent_trigger_id=sent_trigger_id,  # PHASE 4B: NEW
+            defer=True
         )
 
         # ═══════════════════════════════════════════════════════════════
         # ✅ MODIFIED: Store commitment count in Firestore
         # ═══════════════════════════════════════════════════════════════
-        db.collection("users").document(user_id).set({
+        # One merged write: connection state + sync status (raises on failure)
+        flush_connection_writes(user_id, {
             "initial_sync_completed": True,
             "initial_sync_completed_at": firestore.SERVER_TIMESTAMP,
             "sync_in_progress": False,
             "gmail_connection_id": connection_id,
             "trigger_registered": True,
             "total_commitments_found": commitment_count, 
-        }, merge=True)
+        })
 
         print(f"{'='*80}")
         print(f"🎉 FIRST-TIME SETUP COMPLETE")
@@ -430,6 +481,10 @@ def run_initial_sync_and_trigger_first_time(user_id: str, connection_id: str, gm
             "sync_in_progress": False,
             "sync_error": str(e)
         }, merge=True)
+    
+    finally:
+        # Never leave a queued first-connection write for a later flush to apply
+        discard_connection_writes(user_id)
 
 
 
@@ -452,30 +507,8 @@ def create_trigger_on_reconnection(user_id: str, connection_id: str):
     try:
         composio = Composio(api_key=COMPOSIO_API_KEY)
 
-        # Create INBOX trigger
-        print("📬 Creating INBOX trigger...")
-        inbox_trigger = composio.triggers.create(
-            slug="GMAIL_NEW_GMAIL_MESSAGE",
-            user_id=user_id,
-            connected_account_id=connection_id,
-            trigger_config={}
-        )
-        inbox_trigger_id = getattr(inbox_trigger, "id", None) or getattr(inbox_trigger, "trigger_id", None)
-        print(f"✅ INBOX trigger created: {inbox_trigger_id}\n")
-
-        # PHASE 4B: Create SENT trigger
-        print("📤 Creating SENT trigger...")
-        sent_trigger = composio.triggers.create(
-            slug="GMAIL_EMAIL_SENT_TRIGGER",
-            user_id=user_id,
-            connected_account_id=connection_id,
-            trigger_config={
-                "interval": 1,
-                "userId": "me"
-            }
-        )
-        sent_trigger_id = getattr(sent_trigger, "id", None) or getattr(sent_trigger, "trigger_id", None)
-        print(f"✅ SENT trigger created: {sent_trigger_id}\n")
+        # Create INBOX + SENT triggers (PHASE 4B) concurrently
+        inbox_trigger_id, sent_trigger_id = create_gmail_triggers(composio, user_id, connection_id)
 
         # Mark reconnection with BOTH triggers
         mark_reconnection(
@@ -599,13 +632,13 @@ def check_gmail_connection(request: Request, background_tasks: BackgroundTasks):
                 "sync_status": "not_connected"
             }
 
-        # Get connection state
-        connection_state = get_connection_state(uid)
-        is_first_time = connection_state["is_first_time"]
+        # Get connection state (fresh read: is_first_time decides whether a full sync starts)
+        connection_state = get_connection_state(uid, use_cache=False)
+        is_first_time = connection_state.is_first_time
         
         print(f"📊 Connection state:")
         print(f"   • First time: {is_first_time}")
-        print(f"   • First connected at: {connection_state.get('first_connected_at')}")
+        print(f"   • First connected at: {connection_state.first_connected_at}")
         
         # Check sync status
         sync_status = get_user_sync_status(uid)
@@ -753,10 +786,10 @@ def disconnect_gmail_endpoint(request: Request):
     try:
         composio = Composio(api_key=COMPOSIO_API_KEY)
         
-        # Get connection state to find trigger IDs
-        connection_state = get_connection_state(uid)
-        inbox_trigger_id = connection_state.get("inbox_trigger_id")
-        sent_trigger_id = connection_state.get("sent_trigger_id")
+        # Get connection state to find trigger IDs (fresh read; we act on these IDs)
+        connection_state = get_connection_state(uid, use_cache=False)
+        inbox_trigger_id = connection_state.inbox_trigger_id
+        sent_trigger_id = connection_state.sent_trigger_id
         
         # Delete INBOX trigger
         if inbox_trigger_id:
@@ -1085,9 +1118,9 @@ def get_sync_status(request: Request):
         "sync": sync_status,
         "commitments_found": commitment_count,  # ✅ NEW
         "connection_state": {
-            "is_first_time": connection_state["is_first_time"],
-            "first_connected_at": str(connection_state.get("first_connected_at")) if connection_state.get("first_connected_at") else None,
-            "composio_enabled": connection_state["composio_enabled"]
+            "is_first_time": connection_state.is_first_time,
+            "first_connected_at": str(connection_state.first_connected_at) if connection_state.first_connected_at else None,
+            "composio_enabled": connection_state.composio_enabled
         }
     }
 
@@ -1123,12 +1156,12 @@ def debug_connection_info(request: Request):
             "connections": connection_list,
             "sync_status": sync_status,
             "connection_state": {
-                "is_first_time": connection_state["is_first_time"],
-                "first_connected_at": str(connection_state.get("first_connected_at")) if connection_state.get("first_connected_at") else None,
-                "composio_enabled": connection_state["composio_enabled"],
-                "inbox_trigger_id": connection_state.get("inbox_trigger_id"),
-                "sent_trigger_id": connection_state.get("sent_trigger_id"),
-                "entity_id": connection_state.get("entity_id")
+                "is_first_time": connection_state.is_first_time,
+                "first_connected_at": str(connection_state.first_connected_at) if connection_state.first_connected_at else None,
+                "composio_enabled": connection_state.composio_enabled,
+                "inbox_trigger_id": connection_state.inbox_trigger_id,
+                "sent_trigger_id": connection_state.sent_trigger_id,
+                "entity_id": connection_state.entity_id
             }
         }
         
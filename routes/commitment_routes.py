@@ -17,6 +17,8 @@ from firebase_admin import auth, firestore
 from pydantic import BaseModel
 from typing import Optional, List
 
+from services.gmail.commitments import bump_commitments_version
+
 # Redis for deleted items backup
 try:
     from upstash_redis import Redis
@@ -263,6 +265,7 @@ async def mark_commitment_complete(
             update_data["completed_at"] = None
         
         doc_ref.update(update_data)
+        bump_commitments_version(user_id)
         
         action = "completed" if body.completed else "reopened"
         print(f"✅ Commitment {commitment_id} marked as {action}")
@@ -313,6 +316,7 @@ async def delete_commitment(request: Request, commitment_id: str):
         commitment_data = doc_snapshot.to_dict()
         backup_to_redis(user_id, commitment_id, commitment_data)
         doc_ref.delete()
+        bump_commitments_version(user_id)
         
         print(f"✅ Commitment {commitment_id} deleted")
         
@@ -542,6 +546,7 @@ async def restore_deleted_commitment(request: Request, commitment_id: str):
         commitment_data["status"] = "active"
         
         doc_ref.set(commitment_data)
+        bump_commitments_version(user_id)
         
         # Remove from Redis
         redis_client.delete(key)
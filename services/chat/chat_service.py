@@ -14,23 +14,77 @@ Features:
 
 import os
 import json
+import functools
 import requests
 from datetime import date, datetime, timezone, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, replace
 from typing import Optional
+from cachetools import TTLCache
 from openai import OpenAI
 
 from .prompts import get_system_prompt, get_tools
 from .conversation_store import ConversationStore, Message, create_conversation_store
 from credit_engine import calculate_credits_spent, deduct_credits
+from services.gmail.commitments import CommitmentFilters, get_commitments_version
 
 
 
 # Backend URL for commitment API
 BACKEND_URL = os.getenv("BACKEND_URL", "https://cllabackendserver-production.up.railway.app")
 
-
-@dataclass
+# get_commitments arguments copied onto CommitmentFilters as-is when set
+_PASSTHROUGH_FILTER_ARGS = (
+    "sender_name",
+    "sender_email",
+    "sender_role",
+    "priority",
+    "search_text",
+    "direction",  # PHASE 4B
+)
+
+
+def _status_display(status: str, days_overdue: int, completed: bool) -> str:
+    """Human-readable status for the LLM context."""
+    if status == "overdue" and days_overdue:
+        return f"Overdue - {days_overdue} days!"
+    if status == "due_today":
+        return "Due today"
+    if completed:
+        return "Completed"
+    return status.replace("_", " ").capitalize()
+
+
+def _llm_commitment_row(c) -> dict:
+    """Convert a CommitmentItem into the compact dict sent to the LLM."""
+    sender_name = c.email_sender_name or c.email_sender or "Unknown"
+    sender_role = c.sender_role.capitalize() if c.sender_role else "Unknown"
+    status = c.status or "active"
+    days_overdue = c.days_overdue
+    completed = c.completed
+    
+    return {
+        "what": c.what,
+        "deadline": c.deadline_iso or "No deadline",
+        "status": status,
+        "status_display": _status_display(status, days_overdue, completed),
+        "days_overdue": days_overdue if days_overdue else None,
+        "priority": c.priority,
+        "estimated_hours": c.estimated_hours,
+        "from": f"{sender_name} ({sender_role})",
+        "sender_name": sender_name,
+        "sender_role": sender_role,
+        "completed": completed,
+        "completed_at": getattr(c, "completed_at", None)
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_iso_date(value: str) -> date:
+    """Parse a YYYY-MM-DD string (cached; LLM tool calls repeat the same few dates)."""
+    return date.fromisoformat(value)
+
+
+@dataclass(slots=True)
 class ChatRequest:
     """Input request for chat service."""
     user_id: str
@@ -46,10 +100,14 @@ class ChatRequest:
         )
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "user_id": self.user_id,
+            "message": self.message,
+            "chat_page_id": self.chat_page_id
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatResponse:
     """Output response from chat service."""
     success: bool
@@ -90,6 +148,9 @@ class ChatResponse:
 class ChatServiceV3:
     """Chat Service with Conversation History and Commitment Persistence."""
     
+    HISTORY_WINDOW = 12  # Max history messages sent to the LLM per request
+    COMMITMENT_CACHE_TTL = 30  # Seconds to reuse an identical commitment fetch
+    
     def __init__(
         self,
         openai_api_key: str,
@@ -101,6 +162,7 @@ class ChatServiceV3:
         self.client = OpenAI(api_key=openai_api_key)
         self.model = model
         self.fetch_commitments = commitment_fetcher
+        self._commitment_cache = TTLCache(maxsize=1024, ttl=self.COMMITMENT_CACHE_TTL)
         self.store = create_conversation_store(redis_url, redis_token)
         self.redis_url = redis_url
         self.redis_token = redis_token
@@ -243,10 +305,11 @@ class ChatServiceV3:
             )
     
     def _build_messages_with_history(self, history: list[Message], current_message: str) -> list[dict]:
-        """Build messages array with conversation history."""
+        """Build messages array with the most recent conversation history."""
         messages = [{"role": "system", "content": get_system_prompt()}]
         
-        for msg in history:
+        # Only the last HISTORY_WINDOW messages are sent to keep prompt tokens bounded
+        for msg in history[-self.HISTORY_WINDOW:]:
             messages.append({"role": msg.role, "content": msg.content})
         
         messages.append({"role": "user", "content": current_message})
@@ -341,10 +404,12 @@ class ChatServiceV3:
             "content": json.dumps(function_result)
         })
         
+        # Tools are omitted so the model can only summarize the result
         response = self.client.chat.completions.create(
             model=self.model,
             messages=messages,
-            temperature=0.7
+            temperature=0.3,
+            max_tokens=500
         )
         
         total_tokens = tokens_so_far + (response.usage.total_tokens if response.usage else 0)
@@ -464,29 +529,27 @@ class ChatServiceV3:
         tokens_so_far: int
     ) -> ChatResponse:
         """Handle get_today_snapshot function call."""
-        from services.gmail.commitments.filters import CommitmentFilters
-        
         today = date.today()
         tomorrow = today + timedelta(days=1)
         today_start = datetime.combine(today, datetime.min.time()).replace(tzinfo=timezone.utc)
         today_end = datetime.combine(tomorrow, datetime.min.time()).replace(tzinfo=timezone.utc)
         
-        overdue_result = self.fetch_commitments(
+        overdue_result = self._fetch_commitments_cached(
             request.user_id,
             CommitmentFilters(status=["overdue"])
         )
         
-        due_today_result = self.fetch_commitments(
+        due_today_result = self._fetch_commitments_cached(
             request.user_id,
             CommitmentFilters(deadline_after=today, deadline_before=today)
         )
         
-        received_today_result = self.fetch_commitments(
+        received_today_result = self._fetch_commitments_cached(
             request.user_id,
             CommitmentFilters(created_after=today_start, created_before=today_end)
         )
         
-        due_tomorrow_result = self.fetch_commitments(
+        due_tomorrow_result = self._fetch_commitments_cached(
             request.user_id,
             CommitmentFilters(deadline_after=tomorrow, deadline_before=tomorrow)
         )
@@ -529,10 +592,12 @@ class ChatServiceV3:
             "content": json.dumps(function_result)
         })
         
+        # Tools are omitted so the model can only summarize the result
         response = self.client.chat.completions.create(
             model=self.model,
             messages=messages,
-            temperature=0.7
+            temperature=0.3,
+            max_tokens=500
         )
         
         total_tokens = tokens_so_far + (response.usage.total_tokens if response.usage else 0)
@@ -641,7 +706,7 @@ class ChatServiceV3:
         """Handle get_commitments function call."""
         
         filters = self._build_filters(args)
-        result = self.fetch_commitments(request.user_id, filters)
+        result = self._fetch_commitments_cached(request.user_id, filters)
         
         # Filter by completed_today if requested
         completed_today = args.get("completed_today", False)
@@ -660,8 +725,12 @@ class ChatServiceV3:
                         pass
             
             original_count = result.total_found
-            result.all_commitments = filtered_commitments
-            result.total_found = len(filtered_commitments)
+            # Copy rather than mutate: the fetched result may be shared via the cache
+            result = replace(
+                result,
+                all_commitments=filtered_commitments,
+                total_found=len(filtered_commitments)
+            )
             print(f"📊 Filtered completed items: {original_count} → {result.total_found} (today only)")
         
         function_result = {
@@ -685,10 +754,12 @@ class ChatServiceV3:
             "content": json.dumps(function_result)
         })
         
+        # Tools are omitted so the model can only summarize the result
         response = self.client.chat.completions.create(
             model=self.model,
             messages=messages,
-            temperature=0.7
+            temperature=0.3,
+            max_tokens=500
         )
         
         total_tokens = tokens_so_far + (response.usage.total_tokens if response.usage else 0)
@@ -758,85 +829,68 @@ class ChatServiceV3:
             tokens_used=total_tokens
         )
     
+    def _fetch_commitments_cached(self, user_id: str, filters):
+        """
+        Fetch commitments, reusing the result of an identical query made within
+        COMMITMENT_CACHE_TTL seconds. Writes made in this process bump the user's
+        version, which is part of the key, so they are seen immediately. The
+        version is process-local: writes from other workers (e.g. the email
+        webhook) can be missed for up to COMMITMENT_CACHE_TTL seconds.
+        """
+        # CommitmentFilters is frozen and hashable, so it is the key itself
+        key = (user_id, get_commitments_version(user_id), filters)
+        result = self._commitment_cache.get(key)
+        if result is None:
+            result = self.fetch_commitments(user_id, filters)
+            self._commitment_cache[key] = result
+        return result
+    
     def _build_filters(self, args: dict):
         """Convert function arguments to CommitmentFilters."""
-        from services.gmail.commitments.filters import CommitmentFilters
-        
-        filters = CommitmentFilters()
+        if args.get("show_all"):
+            return CommitmentFilters()
+        
+        # CommitmentFilters is frozen: collect everything, then construct once
+        kwargs = {}
+        for key in _PASSTHROUGH_FILTER_ARGS:
+            value = args.get(key)
+            if value:
+                kwargs[key] = value
+        
+        deadline_date = args.get("deadline_date")
+        deadline_from = args.get("deadline_from")
+        deadline_to = args.get("deadline_to")
+        
+        if deadline_date:
+            d = _parse_iso_date(deadline_date)
+            kwargs["deadline_after"] = d
+            kwargs["deadline_before"] = d
+        else:
+            if deadline_from:
+                kwargs["deadline_after"] = _parse_iso_date(deadline_from)
+            if deadline_to:
+                kwargs["deadline_before"] = _parse_iso_date(deadline_to)
         
-        if args.get("status"):
-            if not args.get("deadline_date") and not args.get("deadline_from") and not args.get("deadline_to"):
-                filters.status = args["status"]
+        # Status is ignored when an explicit deadline is given
+        status = args.get("status")
+        if status and not (deadline_date or deadline_from or deadline_to):
+            kwargs["status"] = status
         
-        if args.get("deadline_date"):
-            d = date.fromisoformat(args["deadline_date"])
-            filters.deadline_after = d
-            filters.deadline_before = d
-        else:
-            if args.get("deadline_from"):
-                filters.deadline_after = date.fromisoformat(args["deadline_from"])
-            if args.get("deadline_to"):
-                filters.deadline_before = date.fromisoformat(args["deadline_to"])
-        
-        if args.get("sender_name"):
-            filters.sender_name = args["sender_name"]
-        if args.get("sender_email"):
-            filters.sender_email = args["sender_email"]
-        if args.get("sender_role"):
-            filters.sender_role = args["sender_role"]
-        if args.get("priority"):
-            filters.priority = args["priority"]
-        if args.get("search_text"):
-            filters.search_text = args["search_text"]
         if args.get("has_deadline") is False:
-            filters.has_deadline = False
+            kwargs["has_deadline"] = False
         if args.get("only_completed"):
-            filters.only_completed = True
+            kwargs["only_completed"] = True
         
-        # PHASE 4B: Direction and Assignment filters
-        if args.get("direction"):
-            filters.direction = args["direction"]
-        if args.get("assigned_to_me") is not None:
-            filters.assigned_to_me = args["assigned_to_me"]
-        
-        if args.get("show_all"):
-            filters = CommitmentFilters()
+        # PHASE 4B: Assignment filter (False is a meaningful value)
+        assigned_to_me = args.get("assigned_to_me")
+        if assigned_to_me is not None:
+            kwargs["assigned_to_me"] = assigned_to_me
         
-        return filters
+        return CommitmentFilters(**kwargs)
     
     def _prepare_commitments_for_llm(self, result) -> list[dict]:
         """Prepare commitment data for LLM context."""
-        commitments = []
-        for c in result.all_commitments[:15]:
-            sender_name = c.email_sender_name or c.email_sender or "Unknown"
-            sender_role = c.sender_role.capitalize() if c.sender_role else "Unknown"
-            sender_display = f"{sender_name} ({sender_role})"
-            
-            status = c.status or "active"
-            if status == "overdue" and c.days_overdue:
-                status_display = f"Overdue - {c.days_overdue} days!"
-            elif status == "due_today":
-                status_display = "Due today"
-            elif c.completed:
-                status_display = "Completed"
-            else:
-                status_display = status.replace("_", " ").capitalize()
-            
-            commitments.append({
-                "what": c.what,
-                "deadline": c.deadline_iso or "No deadline",
-                "status": status,
-                "status_display": status_display,
-                "days_overdue": c.days_overdue if c.days_overdue else None,
-                "priority": c.priority,
-                "estimated_hours": c.estimated_hours,
-                "from": sender_display,
-                "sender_name": sender_name,
-                "sender_role": sender_role,
-                "completed": c.completed,
-                "completed_at": c.completed_at if hasattr(c, 'completed_at') else None
-            })
-        return commitments
+        return [_llm_commitment_row(c) for c in result.all_commitments[:15]]
     
     def _commitment_to_dict(self, commitment) -> dict:
         """Convert CommitmentItem to dict for API response."""
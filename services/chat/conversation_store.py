@@ -11,12 +11,13 @@ Firestore Structure:
 """
 
 import os
-import json
-import uuid
+import secrets
 from datetime import datetime, timezone
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 from typing import Optional, List
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from firebase_admin import firestore
 
@@ -25,7 +26,7 @@ from firebase_admin import firestore
 # DATA MODELS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Single message in conversation."""
     role: str  # "user" or "assistant"
@@ -37,7 +38,7 @@ class Message:
             self.timestamp = datetime.now(timezone.utc).isoformat()
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {"role": self.role, "content": self.content, "timestamp": self.timestamp}
     
     @classmethod
     def from_dict(cls, data: dict) -> "Message":
@@ -48,7 +49,7 @@ class Message:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     """Single conversation exchange (user + assistant)."""
     conversation_id: str
@@ -63,36 +64,34 @@ class Conversation:
     summary: Optional[dict] = None  # ← NEW: Store summary data
     
     def to_dict(self) -> dict:
-        return {
-            "conversation_id": self.conversation_id,
-            "user_message": self.user_message,
-            "assistant_message": self.assistant_message,
-            "timestamp": self.timestamp,
-            "intent": self.intent,
-            "function_called": self.function_called,
-            "filters_applied": self.filters_applied,
-            "commitments_found": self.commitments_found,
-            "commitments": self.commitments,  # ← NEW
-            "summary": self.summary  # ← NEW
-        }
+        return {n: getattr(self, n) for n in self._FIELD_NAMES}
     
     @classmethod
     def from_dict(cls, data: dict) -> "Conversation":
-        return cls(
-            conversation_id=data.get("conversation_id", ""),
-            user_message=data.get("user_message", ""),
-            assistant_message=data.get("assistant_message", ""),
-            timestamp=data.get("timestamp", ""),
-            intent=data.get("intent", ""),
-            function_called=data.get("function_called"),
-            filters_applied=data.get("filters_applied"),
-            commitments_found=data.get("commitments_found", 0),
-            commitments=data.get("commitments", []),  # ← NEW
-            summary=data.get("summary")  # ← NEW
-        )
+        # Start from the shared defaults and overlay only the known keys present in the doc
+        values = {**_CONVERSATION_DEFAULTS, **{n: data[n] for n in cls._FIELD_NAMES if n in data}}
+        if values["commitments"] is None:
+            values["commitments"] = []
+        return cls(**values)
+
 
+Conversation._FIELD_NAMES = tuple(f.name for f in fields(Conversation))
 
-@dataclass
+_CONVERSATION_DEFAULTS = {
+    "conversation_id": "",
+    "user_message": "",
+    "assistant_message": "",
+    "timestamp": "",
+    "intent": "",
+    "function_called": None,
+    "filters_applied": None,
+    "commitments_found": 0,
+    "commitments": None,  # Replaced with a fresh list in from_dict
+    "summary": None,
+}
+
+
+@dataclass(slots=True)
 class ChatPage:
     """Chat page container."""
     chat_page_id: str
@@ -103,26 +102,28 @@ class ChatPage:
     conversations: list[Conversation] = field(default_factory=list)
     
     def to_dict(self) -> dict:
-        return {
-            "chat_page_id": self.chat_page_id,
-            "user_id": self.user_id,
-            "title": self.title,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at
-        }
+        return {n: getattr(self, n) for n in self._FIELD_NAMES}
     
     @classmethod
     def from_dict(cls, data: dict, conversations: list = None) -> "ChatPage":
         return cls(
-            chat_page_id=data.get("chat_page_id", ""),
-            user_id=data.get("user_id", ""),
-            title=data.get("title", "New Chat"),
-            created_at=data.get("created_at", ""),
-            updated_at=data.get("updated_at", ""),
+            **{n: data.get(n, _CHAT_PAGE_DEFAULTS[n]) for n in cls._FIELD_NAMES},
             conversations=conversations or []
         )
 
 
+# Conversations live in a subcollection, so they are not part of the page document
+ChatPage._FIELD_NAMES = tuple(f.name for f in fields(ChatPage) if f.name != "conversations")
+
+_CHAT_PAGE_DEFAULTS = {
+    "chat_page_id": "",
+    "user_id": "",
+    "title": "New Chat",
+    "created_at": "",
+    "updated_at": "",
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # UPSTASH REDIS CLIENT
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -137,13 +138,17 @@ class UpstashRedis:
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
+        # Reuse one connection so the TLS handshake is paid once, not per command
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        # Larger pool so concurrent chat requests don't queue on a single socket
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
     
     def _request(self, command: list) -> any:
         """Execute Redis command via REST API."""
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.url}",
-                headers=self.headers,
                 json=command,
                 timeout=5
             )
@@ -155,6 +160,28 @@ class UpstashRedis:
             print(f"Redis error: {e}")
             return None
     
+    def multi_exec(self, commands: list[list]) -> Optional[list]:
+        """
+        Execute several commands as one atomic MULTI/EXEC transaction.
+        Returns one result per command, or None if the transaction failed.
+        """
+        try:
+            response = self._session.post(
+                f"{self.url}/multi-exec",
+                json=commands,
+                timeout=5
+            )
+            if response.status_code == 200:
+                return [item.get("result") for item in response.json()]
+            return None
+        except Exception as e:
+            print(f"Redis error: {e}")
+            return None
+    
+    def lrange(self, key: str, start: int, stop: int) -> list:
+        """Get list elements between start and stop (inclusive, negative = from the end)."""
+        return self._request(["LRANGE", key, str(start), str(stop)]) or []
+    
     def get(self, key: str) -> Optional[str]:
         """Get value by key."""
         return self._request(["GET", key])
@@ -191,6 +218,9 @@ class ConversationStore:
     
     CACHE_TTL = 1800  # 30 minutes
     MAX_HISTORY_MESSAGES = 20  # Max messages to keep in context
+    MAX_CACHED_CONTENT_CHARS = 4096  # Per-message content cap in Redis
+    DELETE_BATCH_SIZE = 500  # Firestore WriteBatch limit
+    HISTORY_FIELDS = ["user_message", "assistant_message", "timestamp"]  # Projection for LLM history reads
     
     def __init__(self, redis_url: str = None, redis_token: str = None):
         self.db = firestore.client()
@@ -207,12 +237,12 @@ class ConversationStore:
             print("⚠️ Redis not configured, using Firestore only")
     
     def _cache_key(self, user_id: str, chat_page_id: str) -> str:
-        """Generate cache key."""
-        return f"chat:{user_id}:{chat_page_id}"
+        """Generate cache key (a Redis list, one JSON message per element)."""
+        return f"chat_history:{user_id}:{chat_page_id}"
     
     def _generate_id(self, prefix: str = "") -> str:
         """Generate unique ID."""
-        unique = uuid.uuid4().hex[:12]
+        unique = secrets.token_hex(6)
         return f"{prefix}_{unique}" if prefix else unique
     
     def _generate_title(self, first_message: str) -> str:
@@ -287,13 +317,21 @@ class ConversationStore:
     
     def delete_chat_page(self, user_id: str, chat_page_id: str):
         """Delete a chat page and all its conversations."""
-        # Delete all conversations first
+        # Delete all conversations first, in batches (Firestore allows 500 writes per batch)
         convs_ref = self._get_conversations_ref(user_id, chat_page_id)
+        batch = self.db.batch()
+        pending = 0
         for doc in convs_ref.stream():
-            doc.reference.delete()
+            batch.delete(doc.reference)
+            pending += 1
+            if pending == self.DELETE_BATCH_SIZE:
+                batch.commit()
+                batch = self.db.batch()
+                pending = 0
         
-        # Delete chat page
-        self._get_chat_ref(user_id, chat_page_id).delete()
+        # Delete chat page in the final batch
+        batch.delete(self._get_chat_ref(user_id, chat_page_id))
+        batch.commit()
         
         # Clear cache
         self.clear_cache(user_id, chat_page_id)
@@ -333,18 +371,20 @@ class ConversationStore:
             summary=summary  # ← NEW
         )
         
-        # Save to Firestore: users/{user_id}/chats/{chat_page_id}/conversations/{conv_id}
-        self._get_conversations_ref(user_id, chat_page_id).document(
-            conversation.conversation_id
-        ).set(conversation.to_dict())
-        
-        # Update chat page timestamp
-        self._get_chat_ref(user_id, chat_page_id).update({
+        # Save conversation and bump the chat page timestamp in one commit
+        # users/{user_id}/chats/{chat_page_id}/conversations/{conv_id}
+        batch = self.db.batch()
+        batch.set(
+            self._get_conversations_ref(user_id, chat_page_id).document(conversation.conversation_id),
+            conversation.to_dict()
+        )
+        batch.update(self._get_chat_ref(user_id, chat_page_id), {
             "updated_at": now
         })
+        batch.commit()
         
         # Update Redis cache
-        self._update_cache(user_id, chat_page_id)
+        self._append_to_cache(user_id, chat_page_id, conversation)
         
         print(f"💾 Saved conversation with {len(commitments or [])} commitments")
         return conversation
@@ -374,29 +414,45 @@ class ConversationStore:
         # Try Redis cache first
         if self.redis:
             cache_key = self._cache_key(user_id, chat_page_id)
-            cached = self.redis.get(cache_key)
+            cached = self.redis.lrange(cache_key, -self.MAX_HISTORY_MESSAGES, -1)
             if cached:
                 try:
-                    data = json.loads(cached)
-                    messages = [Message.from_dict(m) for m in data.get("messages", [])]
+                    messages = [Message.from_dict(orjson.loads(m)) for m in cached]
                     print(f"📦 Cache hit: {len(messages)} messages")
-                    return messages[-self.MAX_HISTORY_MESSAGES:]
-                except json.JSONDecodeError:
+                    return messages
+                except orjson.JSONDecodeError:
                     pass
         
         # Fallback to Firestore
         print("📂 Fetching from Firestore...")
-        conversations = self.get_conversations(user_id, chat_page_id)
-        
-        messages = []
-        for conv in conversations:
-            messages.append(Message(role="user", content=conv.user_message, timestamp=conv.timestamp))
-            messages.append(Message(role="assistant", content=conv.assistant_message, timestamp=conv.timestamp))
+        messages = list(self._stream_message_dicts(user_id, chat_page_id))
         
         # Update cache
         self._set_cache(user_id, chat_page_id, messages)
         
-        return messages[-self.MAX_HISTORY_MESSAGES:]
+        return [Message.from_dict(m) for m in messages[-self.MAX_HISTORY_MESSAGES:]]
+    
+    def _stream_message_dicts(self, user_id: str, chat_page_id: str, limit: int = None):
+        """
+        Yield user/assistant message dicts straight from Firestore docs.
+        Already in cache format, so no Conversation/Message objects are built.
+        """
+        limit = limit or self.MAX_HISTORY_MESSAGES
+        
+        # Only the fields needed for LLM context; commitments/summary stay on the server
+        docs = (
+            self._get_conversations_ref(user_id, chat_page_id)
+            .select(self.HISTORY_FIELDS)
+            .order_by("timestamp", direction=firestore.Query.ASCENDING)
+            .limit(limit)
+            .stream()
+        )
+        
+        for doc in docs:
+            d = doc.to_dict()
+            timestamp = d.get("timestamp", "")
+            yield {"role": "user", "content": d.get("user_message", ""), "timestamp": timestamp}
+            yield {"role": "assistant", "content": d.get("assistant_message", ""), "timestamp": timestamp}
     
     def _update_cache(self, user_id: str, chat_page_id: str):
         """Update Redis cache after new conversation."""
@@ -404,25 +460,54 @@ class ConversationStore:
             return
         
         # Get fresh conversations and update cache
-        conversations = self.get_conversations(user_id, chat_page_id)
-        messages = []
-        for conv in conversations:
-            messages.append(Message(role="user", content=conv.user_message, timestamp=conv.timestamp))
-            messages.append(Message(role="assistant", content=conv.assistant_message, timestamp=conv.timestamp))
+        messages = list(self._stream_message_dicts(user_id, chat_page_id))
         
         self._set_cache(user_id, chat_page_id, messages)
     
-    def _set_cache(self, user_id: str, chat_page_id: str, messages: list[Message]):
-        """Set Redis cache."""
+    def _append_to_cache(self, user_id: str, chat_page_id: str, conversation: Conversation):
+        """
+        Append a new exchange to the cached history.
+        
+        RPUSHX + LTRIM run in one Redis transaction, so concurrent appends to the
+        same chat page can't overwrite each other. RPUSHX only pushes onto an
+        existing list; on a cache miss the history is rebuilt from Firestore.
+        """
         if not self.redis:
             return
         
         cache_key = self._cache_key(user_id, chat_page_id)
-        data = {
-            "messages": [m.to_dict() for m in messages[-self.MAX_HISTORY_MESSAGES:]],
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }
-        self.redis.set(cache_key, json.dumps(data), ex=self.CACHE_TTL)
+        entries = [
+            self._cache_entry({"role": "user", "content": conversation.user_message, "timestamp": conversation.timestamp}),
+            self._cache_entry({"role": "assistant", "content": conversation.assistant_message, "timestamp": conversation.timestamp}),
+        ]
+        results = self.redis.multi_exec([
+            ["RPUSHX", cache_key, *entries],
+            ["LTRIM", cache_key, str(-self.MAX_HISTORY_MESSAGES), "-1"],
+            ["EXPIRE", cache_key, str(self.CACHE_TTL)],
+        ])
+        
+        if not results or not results[0]:
+            self._update_cache(user_id, chat_page_id)
+    
+    def _cache_entry(self, message: dict) -> str:
+        """Serialize one message dict for the Redis list (content capped; Firestore keeps the full text)."""
+        content = message["content"]
+        if content and len(content) > self.MAX_CACHED_CONTENT_CHARS:
+            message = {**message, "content": content[:self.MAX_CACHED_CONTENT_CHARS], "truncated": True}
+        return orjson.dumps(message).decode()
+    
+    def _set_cache(self, user_id: str, chat_page_id: str, messages: list[dict]):
+        """Replace the Redis cache with message dicts (role/content/timestamp)."""
+        if not self.redis:
+            return
+        
+        cache_key = self._cache_key(user_id, chat_page_id)
+        commands = [["DEL", cache_key]]
+        entries = [self._cache_entry(m) for m in messages[-self.MAX_HISTORY_MESSAGES:]]
+        if entries:
+            commands.append(["RPUSH", cache_key, *entries])
+            commands.append(["EXPIRE", cache_key, str(self.CACHE_TTL)])
+        self.redis.multi_exec(commands)
         print(f"📦 Cache updated: {len(messages)} messages")
     
     def clear_cache(self, user_id: str, chat_page_id: str):
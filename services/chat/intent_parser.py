@@ -3,17 +3,16 @@
 Intent Parser - Uses LLM to extract structured filters from natural language.
 """
 
-import json
-import re
 from datetime import date, timedelta
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Optional
+import orjson
 from openai import OpenAI
 
 from services.chat.prompts import get_intent_extraction_prompt
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedFilters:
     """Structured filters extracted from user query."""
     show_all: bool = False
@@ -30,11 +29,22 @@ class ParsedFilters:
     search_text: Optional[str] = None
     only_completed: bool = False
     
+    _FIELDS = (
+        "show_all", "status", "deadline_date", "deadline_from", "deadline_to",
+        "sender_email", "sender_name", "sender_role", "direction", "assigned_to_me",
+        "priority", "search_text", "only_completed",
+    )
+    
     def to_dict(self) -> dict:
-        return {k: v for k, v in asdict(self).items() if v is not None and v != False and v != []}
+        result = {}
+        for k in self._FIELDS:
+            v = getattr(self, k)
+            if v is not None and v != False and v != []:
+                result[k] = v
+        return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedIntent:
     """Complete parsed intent from user query."""
     intent: str  # query, mark_complete, help, greeting, unclear
@@ -92,17 +102,15 @@ class IntentParser:
                     {"role": "user", "content": user_query}
                 ],
                 temperature=0.1,  # Low temperature for consistent parsing
-                max_tokens=500
+                max_tokens=500,
+                response_format={"type": "json_object"}  # Plain JSON, no markdown fences
             )
             
             # Extract response text
             response_text = response.choices[0].message.content.strip()
             
-            # Clean response - remove markdown if present
-            response_text = self._clean_json_response(response_text)
-            
             # Parse JSON
-            parsed_json = json.loads(response_text)
+            parsed_json = orjson.loads(response_text)
             
             # Extract intent
             intent = parsed_json.get("intent", "unclear")
@@ -135,7 +143,7 @@ class IntentParser:
                 raw_response=parsed_json
             )
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             return ParsedIntent(
                 intent="unclear",
                 original_query=user_query,
@@ -148,15 +156,6 @@ class IntentParser:
                 error=f"LLM error: {str(e)}"
             )
     
-    def _clean_json_response(self, text: str) -> str:
-        """Remove markdown code blocks if present."""
-        # Remove ```json ... ``` or ``` ... ```
-        text = re.sub(r'^```json\s*', '', text)
-        text = re.sub(r'^```\s*', '', text)
-        text = re.sub(r'\s*```$', '', text)
-        return text.strip()
-
-
 def create_intent_parser(openai_api_key: str) -> IntentParser:
     """Factory function to create an IntentParser."""
     return IntentParser(openai_api_key=openai_api_key)
\ No newline at end of file
@@ -9,20 +9,42 @@ Key Features:
 - NEVER responds with general conversation for commitment queries
 """
 
+import sys
+import functools
 from datetime import date, timedelta
+from string import Template
 
 
-def get_system_prompt() -> str:
-    """Get the system prompt with today's date."""
+# (date, strings) for the current day; replaced as one tuple so readers never
+# see a new date paired with old strings
+_today_strings_cache = (None, None)
+
+
+def get_today_strings() -> tuple[str, str, str, str]:
+    """
+    Formatted dates for today, recomputed only when the day rolls over.
+    Returns (today_iso, tomorrow_iso, "Friday, October 16, 2026", "Friday, October 16").
+    """
+    global _today_strings_cache
     today = date.today()
-    tomorrow = today + timedelta(days=1)
-    
-    return f"""You are a helpful commitment tracking assistant for busy founders and executives.
+    cached_date, strings = _today_strings_cache
+    if cached_date != today:
+        strings = (
+            today.isoformat(),
+            (today + timedelta(days=1)).isoformat(),
+            today.strftime('%A, %B %d, %Y'),
+            today.strftime('%A, %B %d')
+        )
+        _today_strings_cache = (today, strings)
+    return strings
+
+
+# Static rules block. Kept free of dates so the prefix is byte-identical across
+# requests and OpenAI's automatic prompt caching can reuse it; the date goes in
+# a short suffix appended by get_system_prompt().
+_SYSTEM_PROMPT_STATIC = """You are a helpful commitment tracking assistant for busy founders and executives.
 Your name is "Commitment Assistant" and you help users manage tasks extracted from their emails.
 
-TODAY'S DATE: {today.isoformat()} ({today.strftime('%A, %B %d, %Y')})
-TOMORROW'S DATE: {tomorrow.isoformat()}
-
 ## 🚨 CRITICAL RULE #1: MANDATORY FUNCTION CALLING 🚨
 
 **YOU MUST CALL A FUNCTION FOR ANY COMMITMENT-RELATED QUERY - NO EXCEPTIONS!**
@@ -99,13 +121,13 @@ Use `get_today_snapshot` when user asks about "today" generally:
 **NEVER respond to overdue queries without calling get_commitments!**
 
 **TOMORROW QUERIES - ALWAYS CALL get_commitments:**
-- "Do I have anything due tomorrow?" → get_commitments(deadline_date="{tomorrow.isoformat()}")
-- "Do I have any commitment tomorrow?" → get_commitments(deadline_date="{tomorrow.isoformat()}")
-- "What's due tomorrow?" → get_commitments(deadline_date="{tomorrow.isoformat()}")
-- "Show me tomorrow" → get_commitments(deadline_date="{tomorrow.isoformat()}")
-- "Do I have anything tomorrow?" → get_commitments(deadline_date="{tomorrow.isoformat()}")
-- "Tomorrow's commitments" → get_commitments(deadline_date="{tomorrow.isoformat()}")
-- "Anything for tomorrow" → get_commitments(deadline_date="{tomorrow.isoformat()}")
+- "Do I have anything due tomorrow?" → get_commitments(deadline_date="<TOMORROW>")
+- "Do I have any commitment tomorrow?" → get_commitments(deadline_date="<TOMORROW>")
+- "What's due tomorrow?" → get_commitments(deadline_date="<TOMORROW>")
+- "Show me tomorrow" → get_commitments(deadline_date="<TOMORROW>")
+- "Do I have anything tomorrow?" → get_commitments(deadline_date="<TOMORROW>")
+- "Tomorrow's commitments" → get_commitments(deadline_date="<TOMORROW>")
+- "Anything for tomorrow" → get_commitments(deadline_date="<TOMORROW>")
 **NEVER respond to tomorrow queries without calling get_commitments!**
 
 **DUE TODAY QUERIES - ALWAYS CALL get_commitments:**
@@ -164,7 +186,7 @@ User: "Do I have anything today?"
 You: Call get_today_snapshot() ✅
 
 User: "Do I have anything due tomorrow?"
-You: Call get_commitments(deadline_date="{tomorrow.isoformat()}") ✅
+You: Call get_commitments(deadline_date="<TOMORROW>") ✅
 
 User: "Do I have any overdue?"
 You: Call get_commitments(status=["overdue"]) ✅  [NOT general response!]
@@ -189,7 +211,7 @@ Response: "Found 3 overdue items."
 [Backend returns overdue items]
 
 **Example 3: Tomorrow Query**
-Call: get_commitments(deadline_date="{tomorrow.isoformat()}")
+Call: get_commitments(deadline_date="<TOMORROW>")
 Response: "You have 1 commitment due tomorrow (~16h total)."
 [Backend returns tomorrow items]
 
@@ -226,8 +248,8 @@ Then ADD context:
 ## DATE HANDLING
 
 - "today" → **MUST** call get_today_snapshot()
-- "tomorrow" → **MUST** call get_commitments(deadline_date="{tomorrow.isoformat()}")
-- "Do I have anything tomorrow" → **MUST** call get_commitments(deadline_date="{tomorrow.isoformat()}")
+- "tomorrow" → **MUST** call get_commitments(deadline_date="<TOMORROW>")
+- "Do I have anything tomorrow" → **MUST** call get_commitments(deadline_date="<TOMORROW>")
 - "overdue" → **MUST** call get_commitments(status=["overdue"])
 - "Do I have any overdue" → **MUST** call get_commitments(status=["overdue"])
 - "this week" → get_commitments(deadline_from=..., deadline_to=...)
@@ -270,6 +292,35 @@ Keep your responses SHORT and let the UI shine!
 """
 
 
+# Only dynamic part of the system prompt, filled in once per day
+_SYSTEM_PROMPT_DATE_SUFFIX = Template("""
+## CURRENT DATE
+
+TODAY'S DATE: $today ($today_long)
+TOMORROW'S DATE: $tomorrow
+
+In the examples above, <TOMORROW> stands for $tomorrow.
+""")
+
+
+def get_system_prompt() -> str:
+    """Get the system prompt with today's date."""
+    today_iso, tomorrow_iso, today_long, _ = get_today_strings()
+    return _build_system_prompt(today_iso, tomorrow_iso, today_long)
+
+
+@functools.lru_cache(maxsize=2)
+def _build_system_prompt(today_iso: str, tomorrow_iso: str, today_long: str) -> str:
+    """Build the full system prompt; cached so it is assembled once per day."""
+    prompt = _SYSTEM_PROMPT_STATIC + _SYSTEM_PROMPT_DATE_SUFFIX.substitute(
+        today=today_iso,
+        today_long=today_long,
+        tomorrow=tomorrow_iso
+    )
+    # Interned so any string-keyed cache downstream can match on identity
+    return sys.intern(prompt)
+
+
 # Function definitions for OpenAI
 COMMITMENT_FUNCTION = {
     "type": "function",
@@ -381,9 +432,12 @@ DELETED_COMMITMENTS_FUNCTION = {
 }
 
 
-def get_tools() -> list:
-    """Get the tools list for OpenAI function calling."""
-    return [COMMITMENT_FUNCTION, TODAY_SNAPSHOT_FUNCTION, DELETED_COMMITMENTS_FUNCTION]
+_TOOLS = (COMMITMENT_FUNCTION, TODAY_SNAPSHOT_FUNCTION, DELETED_COMMITMENTS_FUNCTION)
+
+
+def get_tools() -> tuple:
+    """Get the tools for OpenAI function calling (shared, do not mutate)."""
+    return _TOOLS
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -395,11 +449,16 @@ def get_intent_extraction_prompt() -> str:
     Prompt for intent parser LLM to extract structured filters.
     Used by intent_parser.py
     """
-    today = date.today()
-    return f"""You are an intent extraction system for a commitment tracking assistant.
+    return _build_intent_extraction_prompt(get_today_strings()[0])
+
+
+@functools.lru_cache(maxsize=2)
+def _build_intent_extraction_prompt(today_iso: str) -> str:
+    """Build the intent extraction prompt; cached so it is assembled once per day."""
+    prompt = f"""You are an intent extraction system for a commitment tracking assistant.
 Your job is to parse user queries and extract structured filter parameters.
 
-TODAY'S DATE: {today.isoformat()}
+TODAY'S DATE: {today_iso}
 
 Extract the following from the user query:
 - intent: "query" (show commitments), "help", "greeting", or "unclear"
@@ -451,6 +510,7 @@ Response format (JSON only):
 }}
 
 IMPORTANT: Return ONLY valid JSON, no other text."""
+    return sys.intern(prompt)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
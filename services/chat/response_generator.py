@@ -1,15 +1,33 @@
 # services/chat/response_generator.py
 """
 Response Generator - Uses LLM to generate conversational responses.
+
+Not wired into the app yet: ChatService builds its replies itself, and
+nothing imports this module (or intent_parser).
 """
 
-import json
-from datetime import date
-from dataclasses import dataclass, asdict
-from typing import Optional
-from openai import OpenAI
+import functools
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator, Optional
+import orjson
+from cachetools import LRUCache
+
+from services.chat.prompts import get_response_generation_prompt, get_today_strings, HELP_RESPONSE, UNCLEAR_RESPONSE
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+
+_PRIORITY_EMOJI = {"high": "🔴", "medium": "🟡", "low": "🟢"}
 
-from services.chat.prompts import get_response_generation_prompt, HELP_RESPONSE, UNCLEAR_RESPONSE
+
+@functools.lru_cache(maxsize=4)
+def _get_openai_client(api_key: str) -> "OpenAI":
+    """Shared OpenAI client per API key, so its connection pool is reused."""
+    # Imported lazily: help/unclear/greeting/fallback paths never need the SDK
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
 
 
 @dataclass
@@ -23,8 +41,29 @@ class ResponseContext:
     is_empty: bool
     filter_description: str = ""
     
-    def to_dict(self) -> dict:
-        return asdict(self)
+    def to_dict(self, lite: bool = False) -> dict:
+        """
+        Serialize the context.
+        lite=True drops commitments/summary for log and response envelopes.
+        """
+        if lite:
+            return {
+                "user_query": self.user_query,
+                "parsed_date_label": self.parsed_date_label,
+                "total_found": self.total_found,
+                "is_empty": self.is_empty
+            }
+        
+        # Shallow on purpose: asdict() would deep-copy the commitments list
+        return {
+            "user_query": self.user_query,
+            "parsed_date_label": self.parsed_date_label,
+            "commitments": self.commitments,
+            "summary": self.summary,
+            "total_found": self.total_found,
+            "is_empty": self.is_empty,
+            "filter_description": self.filter_description
+        }
 
 
 @dataclass 
@@ -49,9 +88,17 @@ class ResponseGenerator:
     Generates conversational responses using LLM.
     """
     
+    RESPONSE_CACHE_SIZE = 256
+    MAX_RESPONSE_TOKENS = 150  # Prompt asks for 1-3 sentences (~30-60 tokens)
+    STOP_SEQUENCES = ["\n\n\n"]
+    
     def __init__(self, openai_api_key: str, model: str = "gpt-4o-mini"):
-        self.client = OpenAI(api_key=openai_api_key)
+        self.client = _get_openai_client(openai_api_key)
         self.model = model
+        # LRU of generated messages, keyed on the data the message describes.
+        # Shared by concurrent requests, so every access holds the lock.
+        self._response_cache: LRUCache = LRUCache(maxsize=self.RESPONSE_CACHE_SIZE)
+        self._response_cache_lock = threading.Lock()
     
     def generate(self, context: ResponseContext) -> GeneratedResponse:
         """
@@ -63,30 +110,46 @@ class ResponseGenerator:
         Returns:
             GeneratedResponse with message
         """
+        # Nothing found: the deterministic fallback already says everything needed
+        if context.is_empty or context.total_found == 0:
+            return GeneratedResponse(
+                message=self._generate_fallback_response(context),
+                context_used=context.to_dict(lite=True)
+            )
+        
         try:
             # Prepare commitment data for LLM
             commitment_summary = self._prepare_commitments_for_llm(context.commitments)
             
+            # Same results as a recent request -> reuse that message, skip the LLM
+            cache_key = self._response_cache_key(context, commitment_summary)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return GeneratedResponse(
+                    message=cached,
+                    context_used=context.to_dict(lite=True)
+                )
+            
             # Build user message
             user_message = self._build_user_message(context, commitment_summary)
             
             # Call LLM
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": get_response_generation_prompt()},
-                    {"role": "user", "content": user_message}
-                ],
+                messages=self._build_llm_messages(user_message),
                 temperature=0.7,  # Slightly creative for natural responses
-                max_tokens=800
+                max_tokens=self.MAX_RESPONSE_TOKENS,
+                stop=self.STOP_SEQUENCES
             )
             
             message = response.choices[0].message.content.strip()
             tokens_used = response.usage.total_tokens if response.usage else 0
             
+            self._cache_response(cache_key, message)
+            
             return GeneratedResponse(
                 message=message,
-                context_used=context.to_dict(),
+                context_used=context.to_dict(lite=True),
                 tokens_used=tokens_used
             )
             
@@ -95,25 +158,107 @@ class ResponseGenerator:
             fallback = self._generate_fallback_response(context)
             return GeneratedResponse(
                 message=fallback,
-                context_used=context.to_dict(),
+                context_used=context.to_dict(lite=True),
                 error=str(e)
             )
     
+    def generate_stream(self, context: ResponseContext) -> Iterator[str]:
+        """
+        Stream a conversational response as text chunks (for SSE/websockets).
+        
+        Same fast paths and fallback as generate(). The generator's return
+        value is the token count, available via `tokens = yield from ...`.
+        No route streams yet; this is the hook for when chat responses do.
+        """
+        if context.is_empty or context.total_found == 0:
+            yield self._generate_fallback_response(context)
+            return 0
+        
+        commitment_summary = self._prepare_commitments_for_llm(context.commitments)
+        cache_key = self._response_cache_key(context, commitment_summary)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return 0
+        
+        user_message = self._build_user_message(context, commitment_summary)
+        parts = []
+        tokens_used = 0
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_llm_messages(user_message),
+                temperature=0.7,
+                max_tokens=self.MAX_RESPONSE_TOKENS,
+                stop=self.STOP_SEQUENCES,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            for chunk in stream:
+                # Final chunk carries usage and no choices
+                if chunk.usage:
+                    tokens_used = chunk.usage.total_tokens
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            print(f"Response stream error: {e}")
+            if not parts:
+                yield self._generate_fallback_response(context)
+            return tokens_used
+        
+        self._cache_response(cache_key, "".join(parts).strip())
+        return tokens_used
+    
+    def _build_llm_messages(self, user_message: str) -> list[dict]:
+        """System + user messages for a response generation call."""
+        return [
+            {"role": "system", "content": get_response_generation_prompt()},
+            {"role": "user", "content": user_message}
+        ]
+    
+    def _cached_response(self, cache_key: tuple) -> Optional[str]:
+        """Previously generated message for this key (marks it recently used), or None."""
+        with self._response_cache_lock:
+            return self._response_cache.get(cache_key)
+    
+    def _cache_response(self, cache_key: tuple, message: str):
+        """Store a generated message; LRUCache evicts the least recently used entry."""
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = message
+    
     def _prepare_commitments_for_llm(self, commitments: list[dict]) -> list[dict]:
         """Prepare commitment data for LLM (only relevant fields)."""
-        simplified = []
-        for c in commitments[:10]:  # Limit to 10 for token efficiency
-            simplified.append({
-                "what": c.get("what", "Unknown task"),
-                "deadline_iso": c.get("deadline_iso"),
-                "status": c.get("status", "active"),
-                "days_overdue": c.get("days_overdue", 0),
-                "priority": c.get("priority", "medium"),
-                "estimated_hours": c.get("estimated_hours"),
-                "from": c.get("email_sender_name") or c.get("email_sender", "Unknown"),
-                "to_whom": c.get("to_whom"),
-            })
-        return simplified
+        return [{
+            "what": c.get("what", "Unknown task"),
+            "deadline_iso": c.get("deadline_iso"),
+            "status": c.get("status", "active"),
+            "days_overdue": c.get("days_overdue", 0),
+            "priority": c.get("priority", "medium"),
+            "estimated_hours": c.get("estimated_hours"),
+            "from": c.get("email_sender_name") or c.get("email_sender", "Unknown"),
+            "to_whom": c.get("to_whom"),
+        } for c in commitments[:10]]  # Limit to 10 for token efficiency
+    
+    def _response_cache_key(self, context: ResponseContext, commitments: list[dict]) -> tuple:
+        """
+        Cache key for a generated message.
+        Includes the query, counts and commitment data the LLM sees, so a cached
+        message never answers a different question or describes different
+        results (or another user's items).
+        """
+        return (
+            context.user_query,
+            context.filter_description,
+            context.parsed_date_label,
+            context.total_found,
+            context.is_empty,
+            context.summary.get("overdue", 0) > 0,
+            orjson.dumps([context.summary, commitments], option=orjson.OPT_SORT_KEYS, default=str)
+        )
     
     def _build_user_message(self, context: ResponseContext, commitments: list[dict]) -> str:
         """Build the user message for LLM."""
@@ -126,7 +271,8 @@ class ResponseGenerator:
             "summary": context.summary,
             "commitments": commitments
         }
-        return f"Generate a response for this query:\n{json.dumps(data, indent=2)}"
+        # orjson emits compact UTF-8 JSON (no whitespace, no \u escapes)
+        return f"Generate a response for this query:\n{orjson.dumps(data, default=str).decode()}"
     
     def _generate_fallback_response(self, context: ResponseContext) -> str:
         """Generate a simple fallback response without LLM."""
@@ -138,7 +284,7 @@ class ResponseGenerator:
         lines = [f"📋 Found {context.total_found} commitment(s):\n"]
         
         for c in context.commitments[:5]:
-            priority_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(c.get("priority", "medium"), "🟡")
+            priority_emoji = _PRIORITY_EMOJI.get(c.get("priority", "medium"), "🟡")
             line = f"{priority_emoji} {c.get('what', 'Unknown')}"
             if c.get("deadline_iso"):
                 line += f" (Due: {c['deadline_iso']})"
@@ -167,14 +313,14 @@ class ResponseGenerator:
     
     def generate_greeting(self, summary: dict) -> GeneratedResponse:
         """Generate greeting response with summary."""
-        today = date.today()
+        today_label = get_today_strings()[3]
         
         overdue = summary.get("overdue", 0)
         due_today = summary.get("due_today", 0)
         upcoming = summary.get("upcoming", 0)
         total = summary.get("total", 0)
         
-        lines = [f"👋 Hello! Here's your snapshot for {today.strftime('%A, %B %d')}:\n"]
+        lines = [f"👋 Hello! Here's your snapshot for {today_label}:\n"]
         
         if overdue > 0:
             lines.append(f"🔴 {overdue} overdue - needs attention!")
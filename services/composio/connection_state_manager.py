@@ -6,80 +6,225 @@ Prevents duplicate initial_sync on reconnection
 PHASE 4B: Now supports two triggers (INBOX + SENT)
 """
 
+import logging
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from cachetools import TTLCache
 from firebase_admin import firestore
+from google.api_core.exceptions import DeadlineExceeded, InternalServerError, NotFound, ServiceUnavailable
+from google.api_core.retry import Retry, if_exception_type
 from typing import Dict, Optional
 
 
-def _get_db():
-    """Get Firestore client (lazy initialization)"""
-    return firestore.client()
+logger = logging.getLogger(__name__)
 
+_db = None
+_db_lock = threading.Lock()
 
-def get_connection_state(user_id: str) -> Dict:
+# Short-lived per-process cache of connection states, invalidated by mark_*
+STATE_CACHE_TTL = 30  # seconds
+_state_cache: TTLCache = TTLCache(maxsize=10_000, ttl=STATE_CACHE_TTL)
+_state_cache_lock = threading.Lock()
+
+# Transient Firestore errors on state reads are retried with exponential backoff.
+# Falling back to is_first_time=True would trigger a full initial_sync, which is far
+# more expensive than a couple of seconds of retrying.
+_TRANSIENT_ERRORS = if_exception_type(ServiceUnavailable, DeadlineExceeded, InternalServerError)
+_READ_RETRY = Retry(predicate=_TRANSIENT_ERRORS, initial=0.1, multiplier=2.0, maximum=2.0, timeout=5.0)
+
+# Only these parts of the user doc are read (profile, tokens etc. stay on the server)
+STATE_FIELD_PATHS = ["composio_connection"]
+
+# composio_connection fields queued by mark_first_connection(defer=True)
+_pending_writes: Dict[str, Dict] = {}
+_pending_writes_lock = threading.Lock()
+
+
+
+def get_db():
+    """Get Firestore client (lazy initialization, created once per process)"""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                _db = firestore.client()
+    return _db
+
+
+@dataclass(frozen=True, slots=True)
+class ConnectionState:
+    """User's Composio connection state (immutable, so it can be cached and shared)."""
+    is_first_time: bool = True
+    first_connected_at: Optional[datetime] = None
+    composio_enabled: bool = False
+    inbox_trigger_id: Optional[str] = None      # PHASE 4B: INBOX trigger
+    sent_trigger_id: Optional[str] = None       # PHASE 4B: SENT trigger
+    entity_id: Optional[str] = None
+    last_sync_time: Optional[datetime] = None
+
+
+# State for users with no doc (or when the read fails)
+_DEFAULT_STATE = ConnectionState()
+
+
+def _connection_state_from_doc(doc) -> ConnectionState:
+    """Project a user DocumentSnapshot onto a ConnectionState."""
+    if not doc.exists:
+        return _DEFAULT_STATE
+    
+    data = doc.to_dict()
+    composio_conn = data.get("composio_connection", {})
+    
+    first_connected_at = composio_conn.get("first_connected_at")
+    is_first_time = first_connected_at is None
+    
+    return ConnectionState(
+        is_first_time=is_first_time,
+        first_connected_at=first_connected_at,
+        composio_enabled=composio_conn.get("composio_enabled", False),
+        inbox_trigger_id=composio_conn.get("inbox_trigger_id"),      # PHASE 4B
+        sent_trigger_id=composio_conn.get("sent_trigger_id"),        # PHASE 4B: NEW
+        entity_id=composio_conn.get("entity_id"),
+        last_sync_time=composio_conn.get("last_sync_time")
+    )
+
+
+def invalidate_connection_state(user_id: str):
+    """Drop a user's cached state after a write."""
+    with _state_cache_lock:
+        _state_cache.pop(user_id, None)
+
+
+def get_connection_state(user_id: str, use_cache: bool = True) -> ConnectionState:
     """
     Get user's Composio connection state from Firestore.
     
+    Reads are served from a 30s process-local cache when use_cache is True;
+    pass use_cache=False on paths that act on the state (initial sync
+    decision, trigger deletion) to force a fresh read.
+    
     Returns:
-        {
-            "is_first_time": bool,
-            "first_connected_at": datetime,
-            "composio_enabled": bool,
-            "inbox_trigger_id": str,      # PHASE 4B: INBOX trigger
-            "sent_trigger_id": str,       # PHASE 4B: SENT trigger (NEW)
-            "entity_id": str,
-            "last_sync_time": datetime
-        }
+        ConnectionState (shared and immutable - callers must not mutate it)
     """
+    if use_cache:
+        with _state_cache_lock:
+            cached = _state_cache.get(user_id)
+        if cached is not None:
+            return cached
+    
     try:
-        db = _get_db()
-        doc = db.collection("users").document(user_id).get()
+        db = get_db()
+        doc = db.collection("users").document(user_id).get(field_paths=STATE_FIELD_PATHS, retry=_READ_RETRY)
+        state = _connection_state_from_doc(doc)
         
-        if not doc.exists:
-            return {
-                "is_first_time": True,
-                "first_connected_at": None,
-                "composio_enabled": False,
-                "inbox_trigger_id": None,
-                "sent_trigger_id": None,
-                "entity_id": None,
-                "last_sync_time": None
-            }
-        
-        data = doc.to_dict()
-        composio_conn = data.get("composio_connection", {})
-        
-        first_connected_at = composio_conn.get("first_connected_at")
-        is_first_time = first_connected_at is None
+        # Failed reads (below) are never cached
+        with _state_cache_lock:
+            _state_cache[user_id] = state
+        return state
         
-        return {
-            "is_first_time": is_first_time,
-            "first_connected_at": first_connected_at,
-            "composio_enabled": composio_conn.get("composio_enabled", False),
-            "inbox_trigger_id": composio_conn.get("inbox_trigger_id"),      # PHASE 4B
-            "sent_trigger_id": composio_conn.get("sent_trigger_id"),        # PHASE 4B: NEW
-            "entity_id": composio_conn.get("entity_id"),
-            "last_sync_time": composio_conn.get("last_sync_time")
-        }
-        
-    except Exception as e:
-        print(f"❌ Error getting connection state: {e}")
-        return {
-            "is_first_time": True,
-            "first_connected_at": None,
-            "composio_enabled": False,
-            "inbox_trigger_id": None,
-            "sent_trigger_id": None,
-            "entity_id": None,
-            "last_sync_time": None
-        }
+    except Exception:
+        logger.exception("❌ Error getting connection state for user %s after retries - assuming first-time", user_id)
+        return _DEFAULT_STATE
+
+
+def get_connection_states(user_ids: list[str], use_cache: bool = True) -> Dict[str, ConnectionState]:
+    """
+    Get connection states for many users in one Firestore round-trip.
+    
+    Uses db.get_all() so N users cost a single RPC instead of N
+    sequential get_connection_state() calls (cron reconciliation, admin tools).
+    Cached states are reused when use_cache is True; only misses are fetched.
+    
+    Returns:
+        {user_id: ConnectionState}
+    """
+    if not user_ids:
+        return {}
+    
+    # A single user doesn't need the batched request
+    if len(user_ids) == 1:
+        return {user_ids[0]: get_connection_state(user_ids[0], use_cache=use_cache)}
+    
+    states = {}
+    if use_cache:
+        with _state_cache_lock:
+            for uid in user_ids:
+                cached = _state_cache.get(uid)
+                if cached is not None:
+                    states[uid] = cached
+    
+    missing = {uid for uid in user_ids if uid not in states}
+    if missing:
+        try:
+            db = get_db()
+            users = db.collection("users")
+            fetched = {
+                doc.id: _connection_state_from_doc(doc)
+                for doc in db.get_all([users.document(uid) for uid in missing], field_paths=STATE_FIELD_PATHS, retry=_READ_RETRY)
+            }
+            with _state_cache_lock:
+                _state_cache.update(fetched)
+            states.update(fetched)
+            
+        except Exception:
+            logger.exception("❌ Error getting connection states for %d users", len(missing))
+    
+    # Anything missing from the response gets the same default as a failed single read
+    return {uid: states.get(uid, _DEFAULT_STATE) for uid in user_ids}
+
+
+# SERVER_TIMESTAMP is a sentinel object, so it can be bound once at import
+_SERVER_TIMESTAMP = firestore.SERVER_TIMESTAMP
+
+# Fields of the first-connection write that never vary per user
+_FIRST_CONNECTION_CONSTANTS = {
+    "first_connected_at": _SERVER_TIMESTAMP,
+    "is_first_time": False,
+    "composio_enabled": True,
+    "last_sync_time": _SERVER_TIMESTAMP
+}
+
+
+# Dotted update paths for every composio_connection field, built once at import
+_FIELD_PATHS = {name: f"composio_connection.{name}" for name in ConnectionState.__dataclass_fields__}
+
+
+def _nested_updates(fields: Dict) -> Dict:
+    """Map composio_connection field names to their dotted update paths."""
+    return {_FIELD_PATHS[k]: v for k, v in fields.items()}
+
+
+def _first_connection_fields(entity_id: str, inbox_trigger_id: str, sent_trigger_id: str) -> Dict:
+    """composio_connection fields written on first connection."""
+    return {
+        **_FIRST_CONNECTION_CONSTANTS,
+        "inbox_trigger_id": inbox_trigger_id,      # PHASE 4B
+        "sent_trigger_id": sent_trigger_id,        # PHASE 4B: NEW
+        "entity_id": entity_id
+    }
+
+
+def _reconnection_fields(entity_id: str, inbox_trigger_id: str, sent_trigger_id: str) -> Dict:
+    """
+    composio_connection fields written on reconnection.
+    Always written in full: the state cache is per-process and may predate a
+    disconnect handled by another worker, and trigger IDs are new anyway.
+    """
+    return {
+        "composio_enabled": True,
+        "inbox_trigger_id": inbox_trigger_id,      # PHASE 4B
+        "sent_trigger_id": sent_trigger_id,        # PHASE 4B: NEW
+        "entity_id": entity_id
+    }
 
 
 def mark_first_connection(
     user_id: str, 
     entity_id: str, 
     inbox_trigger_id: str,
-    sent_trigger_id: str  # PHASE 4B: NEW parameter
+    sent_trigger_id: str,  # PHASE 4B: NEW parameter
+    defer: bool = False
 ):
     """
     Mark user's first-time connection to Composio.
@@ -92,35 +237,69 @@ def mark_first_connection(
         entity_id: Composio entity ID (connected account)
         inbox_trigger_id: INBOX trigger ID (GMAIL_NEW_GMAIL_MESSAGE)
         sent_trigger_id: SENT trigger ID (GMAIL_EMAIL_SENT_TRIGGER)
+        defer: Queue the write instead; flush_connection_writes() then commits
+               it together with the caller's own user-doc fields in one write
     """
+    connection = _first_connection_fields(entity_id, inbox_trigger_id, sent_trigger_id)
+    
+    if defer:
+        with _pending_writes_lock:
+            _pending_writes.setdefault(user_id, {}).update(connection)
+        logger.debug("   First connection for %s queued until flush", user_id)
+        return True
+    
     try:
-        db = _get_db()
+        db = get_db()
         user_ref = db.collection("users").document(user_id)
         
-        now = firestore.SERVER_TIMESTAMP
+
+        # Plain field update; set(merge=True) only if the user doc doesn't exist yet
+        try:
+            user_ref.update(_nested_updates(connection))
+        except NotFound:
+            user_ref.set({"composio_connection": connection}, merge=True)
         
-        user_ref.set({
-            "composio_connection": {
-                "first_connected_at": now,
-                "is_first_time": False,
-                "composio_enabled": True,
-                "inbox_trigger_id": inbox_trigger_id,      # PHASE 4B
-                "sent_trigger_id": sent_trigger_id,        # PHASE 4B: NEW
-                "entity_id": entity_id,
-                "last_sync_time": now
-            }
-        }, merge=True)
+        invalidate_connection_state(user_id)
         
-        print(f"✅ Marked first connection for user: {user_id}")
-        print(f"   INBOX trigger: {inbox_trigger_id}")
-        print(f"   SENT trigger: {sent_trigger_id}")
+        logger.info("✅ Marked first connection for user: %s", user_id)
+        logger.debug("   INBOX trigger: %s, SENT trigger: %s", inbox_trigger_id, sent_trigger_id)
         return True
         
-    except Exception as e:
-        print(f"❌ Error marking first connection: {e}")
+    except Exception:
+        logger.exception("❌ Error marking first connection for user %s", user_id)
         return False
 
 
+def flush_connection_writes(user_id: str, extra_fields: Optional[Dict] = None):
+    """
+    Commit deferred composio_connection fields plus any extra top-level
+    user-doc fields (e.g. initial_sync_completed) as a single merge write.
+    
+    Raises if the write fails, so the caller's error path runs; the queued
+    fields are dropped either way.
+    """
+    with _pending_writes_lock:
+        connection = _pending_writes.pop(user_id, None)
+    
+    payload = dict(extra_fields or {})
+    if connection:
+        payload["composio_connection"] = connection
+    if not payload:
+        return
+    
+    get_db().collection("users").document(user_id).set(payload, merge=True)
+    invalidate_connection_state(user_id)
+    
+    if connection:
+        logger.info("✅ Marked first connection for user: %s", user_id)
+
+
+def discard_connection_writes(user_id: str):
+    """Drop fields queued by mark_first_connection(defer=True) without writing them."""
+    with _pending_writes_lock:
+        _pending_writes.pop(user_id, None)
+
+
 def mark_reconnection(
     user_id: str, 
     entity_id: str, 
@@ -142,26 +321,30 @@ def mark_reconnection(
         sent_trigger_id: New SENT trigger ID
     """
     try:
-        db = _get_db()
+        db = get_db()
         user_ref = db.collection("users").document(user_id)
+        user_ref.update(_nested_updates(
+            _reconnection_fields(entity_id, inbox_trigger_id, sent_trigger_id)
+        ))
         
-        user_ref.update({
-            "composio_connection.composio_enabled": True,
-            "composio_connection.inbox_trigger_id": inbox_trigger_id,      # PHASE 4B
-            "composio_connection.sent_trigger_id": sent_trigger_id,        # PHASE 4B: NEW
-            "composio_connection.entity_id": entity_id
-        })
+        invalidate_connection_state(user_id)
         
-        print(f"✅ Marked reconnection for user: {user_id}")
-        print(f"   INBOX trigger: {inbox_trigger_id}")
-        print(f"   SENT trigger: {sent_trigger_id}")
+        logger.info("✅ Marked reconnection for user: %s", user_id)
+        logger.debug("   INBOX trigger: %s, SENT trigger: %s", inbox_trigger_id, sent_trigger_id)
         return True
         
-    except Exception as e:
-        print(f"❌ Error marking reconnection: {e}")
+    except Exception:
+        logger.exception("❌ Error marking reconnection for user %s", user_id)
         return False
 
 
+_DISCONNECTION_UPDATES = _nested_updates({
+    "composio_enabled": False,
+    "inbox_trigger_id": None,      # PHASE 4B
+    "sent_trigger_id": None        # PHASE 4B: NEW
+})
+
+
 def mark_disconnection(user_id: str):
     """
     Mark user's disconnection from Composio.
@@ -173,20 +356,18 @@ def mark_disconnection(user_id: str):
         user_id: Firebase user ID
     """
     try:
-        db = _get_db()
+        db = get_db()
         user_ref = db.collection("users").document(user_id)
         
-        user_ref.update({
-            "composio_connection.composio_enabled": False,
-            "composio_connection.inbox_trigger_id": None,      # PHASE 4B
-            "composio_connection.sent_trigger_id": None        # PHASE 4B: NEW
-        })
+        user_ref.update(_DISCONNECTION_UPDATES)
+        
+        invalidate_connection_state(user_id)
         
-        print(f"✅ Marked disconnection for user: {user_id}")
+        logger.info("✅ Marked disconnection for user: %s", user_id)
         return True
         
-    except Exception as e:
-        print(f"❌ Error marking disconnection: {e}")
+    except Exception:
+        logger.exception("❌ Error marking disconnection for user %s", user_id)
         return False
 
 
@@ -198,67 +379,23 @@ def should_run_initial_sync(user_id: str) -> bool:
         True if this is first-time connection (run initial_sync)
         False if this is reconnection (skip initial_sync)
     """
-    state = get_connection_state(user_id)
+    state = get_connection_state(user_id, use_cache=False)
     
-    if state["is_first_time"]:
-        print(f"🆕 First-time connection detected - will run initial_sync")
+    if state.is_first_time:
+        logger.info("🆕 First-time connection detected for %s - will run initial_sync", user_id)
         return True
     else:
-        print(f"🔄 Reconnection detected - will SKIP initial_sync")
-        print(f"   First connected at: {state['first_connected_at']}")
+        logger.info("🔄 Reconnection detected for %s - will SKIP initial_sync", user_id)
+        logger.debug("   First connected at: %s", state.first_connected_at)
         return False
 
 
-# ======================================================
-# MIGRATION HELPER (Optional - for existing users)
-# ======================================================
-
-def migrate_existing_user(user_id: str):
+def should_run_initial_sync_batch(user_ids: list[str]) -> Dict[str, bool]:
     """
-    Migrate existing user to new connection state schema with dual triggers.
-    Call this for users who connected before Phase 4B update.
+    Batched should_run_initial_sync for reconciliation jobs.
+    
+    Returns:
+        {user_id: True if initial_sync should run (first-time connection)}
     """
-    try:
-        db = _get_db()
-        user_ref = db.collection("users").document(user_id)
-        doc = user_ref.get()
-        
-        if not doc.exists:
-            print(f"⚠️ User {user_id} not found")
-            return False
-        
-        data = doc.to_dict()
-        
-        # Check if already migrated to Phase 4B schema
-        composio_conn = data.get("composio_connection", {})
-        if "sent_trigger_id" in composio_conn:
-            print(f"✅ User {user_id} already migrated to Phase 4B")
-            return True
-        
-        # Get old trigger_id (now becomes inbox_trigger_id)
-        old_trigger_id = composio_conn.get("trigger_id") or data.get("trigger_id")
-        
-        # Migrate to new schema
-        now = firestore.SERVER_TIMESTAMP
-        migration_data = {
-            "composio_connection": {
-                "first_connected_at": composio_conn.get("first_connected_at") or now,
-                "is_first_time": False,
-                "composio_enabled": composio_conn.get("composio_enabled", False),
-                "inbox_trigger_id": old_trigger_id,  # Old trigger_id → inbox_trigger_id
-                "sent_trigger_id": None,  # Will be set when they reconnect
-                "entity_id": composio_conn.get("entity_id"),
-                "last_sync_time": composio_conn.get("last_sync_time") or now
-            }
-        }
-        
-        user_ref.set(migration_data, merge=True)
-        
-        print(f"✅ Migrated user {user_id} to Phase 4B schema")
-        print(f"   Old trigger_id → inbox_trigger_id: {old_trigger_id}")
-        print(f"   sent_trigger_id will be created on next reconnection")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error migrating user: {e}")
-        return False
\ No newline at end of file
+    states = get_connection_states(user_ids, use_cache=False)
+    return {uid: state.is_first_time for uid, state in states.items()}
@@ -0,0 +1,155 @@
+# services/composio/connection_state_migration.py
+"""
+One-shot migration of pre-Phase 4B users to the dual-trigger connection state.
+Only used by backfill/admin scripts, so it lives outside connection_state_manager.
+
+Usage:
+    from services.composio.connection_state_migration import migrate_existing_users
+    
+    counts = migrate_existing_users(user_ids)
+"""
+
+import logging
+from firebase_admin import firestore
+from typing import Dict, Optional
+
+from services.composio.connection_state_manager import (
+    get_db,
+    invalidate_connection_state,
+)
+
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_FIELD_PATHS = ["composio_connection", "trigger_id"]  # Pre-4B docs kept trigger_id at top level
+
+
+def _build_migration_data(data: Dict) -> Optional[Dict]:
+    """
+    Build the Phase 4B merge payload for a user doc.
+    Returns None if the doc is already on the Phase 4B schema.
+    """
+    composio_conn = data.get("composio_connection", {})
+    if "sent_trigger_id" in composio_conn:
+        return None
+    
+    # Get old trigger_id (now becomes inbox_trigger_id)
+    old_trigger_id = composio_conn.get("trigger_id") or data.get("trigger_id")
+    
+    now = firestore.SERVER_TIMESTAMP
+    return {
+        "composio_connection": {
+            "first_connected_at": composio_conn.get("first_connected_at") or now,
+            "is_first_time": False,
+            "composio_enabled": composio_conn.get("composio_enabled", False),
+            "inbox_trigger_id": old_trigger_id,  # Old trigger_id → inbox_trigger_id
+            "sent_trigger_id": None,  # Will be set when they reconnect
+            "entity_id": composio_conn.get("entity_id"),
+            "last_sync_time": composio_conn.get("last_sync_time") or now
+        }
+    }
+
+
+@firestore.transactional
+def _migrate_in_transaction(transaction, user_ref):
+    """
+    Read and migrate a user doc atomically.
+    Returns (status, migration_data) where status is "not_found", "already_migrated" or "migrated".
+    """
+    doc = user_ref.get(field_paths=MIGRATION_FIELD_PATHS, transaction=transaction)
+    if not doc.exists:
+        return "not_found", None
+    
+    migration_data = _build_migration_data(doc.to_dict())
+    if migration_data is None:
+        return "already_migrated", None
+    
+    transaction.set(user_ref, migration_data, merge=True)
+    return "migrated", migration_data
+
+
+def migrate_existing_user(user_id: str):
+    """
+    Migrate existing user to new connection state schema with dual triggers.
+    Call this for users who connected before Phase 4B update.
+    
+    The read and the write run in one transaction, so a concurrent
+    reconnection can't be overwritten with stale migration data.
+    """
+    try:
+        db = get_db()
+        user_ref = db.collection("users").document(user_id)
+        
+        status, migration_data = _migrate_in_transaction(db.transaction(), user_ref)
+        
+        if status == "not_found":
+            logger.warning("⚠️ User %s not found", user_id)
+            return False
+        
+        if status == "already_migrated":
+            logger.info("✅ User %s already migrated to Phase 4B", user_id)
+            return True
+        
+        invalidate_connection_state(user_id)
+        old_trigger_id = migration_data["composio_connection"]["inbox_trigger_id"]
+        logger.info("✅ Migrated user %s to Phase 4B schema", user_id)
+        logger.debug("   Old trigger_id → inbox_trigger_id: %s (sent_trigger_id set on next reconnection)", old_trigger_id)
+        return True
+        
+    except Exception:
+        logger.exception("❌ Error migrating user %s", user_id)
+        return False
+
+
+MIGRATION_BATCH_SIZE = 500  # Firestore WriteBatch limit
+
+
+def migrate_existing_users(user_ids: list[str]) -> Dict:
+    """
+    Bulk version of migrate_existing_user for backfills.
+    
+    Reads each chunk of users with a single get_all() call and writes the
+    migrations in one WriteBatch per chunk (up to 500 users per commit).
+    Unlike migrate_existing_user this is not transactional, so run it
+    when users aren't actively reconnecting.
+    
+    Returns:
+        {"migrated": int, "already_migrated": int, "not_found": int, "failed": int}
+    """
+    counts = {"migrated": 0, "already_migrated": 0, "not_found": 0, "failed": 0}
+    db = get_db()
+    users = db.collection("users")
+    
+    for start in range(0, len(user_ids), MIGRATION_BATCH_SIZE):
+        chunk = user_ids[start:start + MIGRATION_BATCH_SIZE]
+        try:
+            batch = db.batch()
+            pending = not_found = already_migrated = 0
+            
+            for doc in db.get_all([users.document(uid) for uid in chunk], field_paths=MIGRATION_FIELD_PATHS):
+                if not doc.exists:
+                    not_found += 1
+                    continue
+                
+                migration_data = _build_migration_data(doc.to_dict())
+                if migration_data is None:
+                    already_migrated += 1
+                    continue
+                
+                batch.set(doc.reference, migration_data, merge=True)
+                pending += 1
+            
+            if pending:
+                batch.commit()
+                for uid in chunk:
+                    invalidate_connection_state(uid)
+            counts["migrated"] += pending
+            counts["not_found"] += not_found
+            counts["already_migrated"] += already_migrated
+            
+        except Exception:
+            logger.exception("❌ Error migrating users %d-%d", start, start + len(chunk) - 1)
+            counts["failed"] += len(chunk)
+    
+    logger.info("✅ Bulk migration done: %s", counts)
+    return counts
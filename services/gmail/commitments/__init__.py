@@ -24,54 +24,81 @@ Usage:
     print(result.to_display_string())
 """
 
-from .filters import (
-    CommitmentFilters,
-    # Preset filter helpers
-    all_active,
-    overdue_only,
-    due_today_only,
-    urgent,
-    from_investors,
-    from_customers,
-    high_priority,
-    created_today,
-    created_this_week,
-    due_this_week,
-    completed_items,
-)
+import importlib
 
-from .models import (
-    CommitmentItem,
-    CommitmentSummary,
-    CommitmentResult,
-    create_empty_result,
-)
+# Exports are resolved lazily (PEP 562): importing the package no longer pulls in
+# every submodule, so e.g. CommitmentFilters doesn't load the Firestore fetcher.
+_SUBMODULE_EXPORTS = {
+    ".filters": (
+        "CommitmentFilters",
+        # Preset filter helpers
+        "all_active",
+        "overdue_only",
+        "due_today_only",
+        "urgent",
+        "from_investors",
+        "from_customers",
+        "high_priority",
+        "created_today",
+        "created_this_week",
+        "due_this_week",
+        "completed_items",
+    ),
+    ".models": (
+        "CommitmentItem",
+        "CommitmentSummary",
+        "CommitmentResult",
+        "create_empty_result",
+    ),
+    ".status_calculator": (
+        "recalculate_status",
+        "categorize_by_deadline",
+        "sort_commitments",
+        "get_urgency_score",
+        "get_priority_score",
+    ),
+    ".fetcher": (
+        "fetch_commitments",
+        # Convenience functions
+        "fetch_all_active",
+        "fetch_overdue",
+        "fetch_due_today",
+        "fetch_urgent",
+        "fetch_from_sender",
+        "fetch_by_search",
+        "fetch_from_investors",
+        "fetch_from_customers",
+        "fetch_high_priority",
+        "fetch_completed",
+        "fetch_created_today",
+        # Cache invalidation
+        "get_commitments_version",
+        "bump_commitments_version",
+    ),
+}
 
-from .status_calculator import (
-    recalculate_status,
-    categorize_by_deadline,
-    sort_commitments,
-    get_urgency_score,
-    get_priority_score,
-)
+_LAZY_EXPORTS = {
+    name: submodule
+    for submodule, names in _SUBMODULE_EXPORTS.items()
+    for name in names
+}
 
-from .fetcher import (
-    fetch_commitments,
-    # Convenience functions
-    fetch_all_active,
-    fetch_overdue,
-    fetch_due_today,
-    fetch_urgent,
-    fetch_from_sender,
-    fetch_by_search,
-    fetch_from_investors,
-    fetch_from_customers,
-    fetch_high_priority,
-    fetch_completed,
-    fetch_created_today,
-)
 
-__all__ = [
+def __getattr__(name):
+    """Import the owning submodule on first access and cache the attribute."""
+    submodule = _LAZY_EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(submodule, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
+__all__ = (
     # Main fetcher
     "fetch_commitments",
     
@@ -110,10 +137,14 @@ __all__ = [
     "fetch_completed",
     "fetch_created_today",
     
+    # Cache invalidation
+    "get_commitments_version",
+    "bump_commitments_version",
+    
     # Status helpers
     "recalculate_status",
     "categorize_by_deadline",
     "sort_commitments",
     "get_urgency_score",
     "get_priority_score",
-]
\ No newline at end of file
+)
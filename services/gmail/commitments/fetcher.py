@@ -20,9 +20,12 @@ Usage:
 """
 
 from __future__ import annotations
+import logging
 import os
+import time
+from functools import lru_cache
 from datetime import date, datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 # Firebase import - optional for testing
 try:
@@ -43,12 +46,55 @@ from .status_calculator import (
     recalculate_status,
     categorize_by_deadline,
     sort_commitments,
+    parse_iso_date,
+    parse_iso_datetime,
 )
 
 
+logger = logging.getLogger(__name__)
+
+
 # Configuration
 UPCOMING_DAYS = int(os.getenv("COMMITMENT_UPCOMING_DAYS", "7"))
 DEFAULT_LIMIT = int(os.getenv("COMMITMENT_DEFAULT_LIMIT", "100"))
+# Set once every commitment doc carries the has_deadline field (written by
+# save_commitment_to_firestore); until then older docs would be missed server-side
+HAS_DEADLINE_INDEXED = os.getenv("COMMITMENT_HAS_DEADLINE_INDEXED", "false").lower() == "true"
+
+# Partial-match filter -> the doc fields it searches (see build_search_blobs)
+SEARCH_BLOB_FIELDS = {
+    "search_blob": ("what", "email_subject"),
+    "sender_email_blob": ("email_sender", "given_by"),
+    "sender_name_blob": ("email_sender_name",),
+}
+
+# Per-user write counter. Callers that cache fetch results include it in their
+# cache key, so bumping it invalidates every cached result for that user.
+# Process-local: writes from other workers don't bump it, so those callers'
+# cache TTL bounds how stale a result can be.
+_commitment_versions: Dict[str, int] = {}
+
+
+def get_commitments_version(user_id: str) -> int:
+    """Get the current write version of a user's commitments."""
+    return _commitment_versions.get(user_id, 0)
+
+
+def bump_commitments_version(user_id: str) -> None:
+    """Mark a user's commitments as changed (call after any write)."""
+    _commitment_versions[user_id] = _commitment_versions.get(user_id, 0) + 1
+
+
+@lru_cache(maxsize=1)
+def _today_bounds_for_minute(epoch_minute: int) -> Tuple[date, datetime, datetime]:
+    """(today, today_start, tomorrow_start) in UTC for the given minute since the epoch."""
+    today_start = datetime.fromtimestamp(epoch_minute * 60, timezone.utc).replace(hour=0, minute=0)
+    return today_start.date(), today_start, today_start + timedelta(days=1)
+
+
+def today_bounds() -> Tuple[date, datetime, datetime]:
+    """Current UTC day and its bounds, recomputed at most once a minute."""
+    return _today_bounds_for_minute(int(time.time() // 60))
 
 
 def fetch_commitments(
@@ -75,7 +121,7 @@ def fetch_commitments(
             raise RuntimeError("Firebase not available. Use mock_fetch_commitments for testing.")
         db = firestore.client()
     
-    today = datetime.now(timezone.utc).date()
+    today = today_bounds()[0]
     
     # ═══════════════════════════════════════════════════════════════
     # STEP 1: Base Firestore Query
@@ -90,51 +136,64 @@ def fetch_commitments(
     else:
         query = collection_ref.where("completed", "==", False)
     
-    # Apply limit
-    query = query.limit(filters.limit or DEFAULT_LIMIT)
+    filters_dict = filters.to_dict()
+    limit = filters.limit or DEFAULT_LIMIT
+    base_query = query
+    
+    # Push what Firestore can answer exactly, so fewer docs come back
+    query = apply_server_filters(query, filters)
     
     # ═══════════════════════════════════════════════════════════════
     # STEP 2: Execute Query
     # ═══════════════════════════════════════════════════════════════
     try:
-        docs = query.stream()
-        raw_commitments = [doc.to_dict() for doc in docs]
-    except Exception as e:
-        print(f"❌ Firestore query failed: {e}")
+        try:
+            # One RunQuery RPC for the whole (limited) result set
+            raw_commitments = [doc.to_dict() for doc in query.limit(limit).get()]
+        except Exception:
+            if query is base_query:
+                raise
+            # e.g. the composite index for a range filter isn't deployed yet;
+            # apply_filters() gives the same result from the unfiltered query
+            logger.warning("⚠️ Filtered Firestore query failed for user=%s, retrying without server-side filters", user_id, exc_info=True)
+            raw_commitments = [doc.to_dict() for doc in base_query.limit(limit).get()]
+    except Exception:
+        logger.exception("❌ Firestore query failed for user=%s", user_id)
         return create_empty_result(
             query_description="Failed to fetch commitments",
-            filters_applied=filters.to_dict(),
+            filters_applied=filters_dict,
             user_id=user_id,
             filter_type="general"
         )
     
     # ═══════════════════════════════════════════════════════════════
-    # STEP 3: Recalculate Status for Each Commitment
+    # STEP 3: Apply Python Filters That Don't Depend on Status
     # ═══════════════════════════════════════════════════════════════
-    for c in raw_commitments:
-        recalculate_status(c, today)
+    filtered = apply_status_independent_filters(raw_commitments, filters, today)
+    del raw_commitments  # Rejected docs can be freed before the rest of the pipeline
     
     # ═══════════════════════════════════════════════════════════════
-    # STEP 4: Apply Python Filters
+    # STEP 4: Recalculate Status for the Survivors, Then Filter on It
     # ═══════════════════════════════════════════════════════════════
-    filtered = apply_filters(raw_commitments, filters, today)
+    # Lazy: each doc is recalculated and status-checked as the sort pulls it,
+    # so the sorted list is the only list built from here on
+    survivors = apply_status_dependent_filters(
+        (recalculate_status(c, today) for c in filtered),
+        filters
+    )
     
     # ═══════════════════════════════════════════════════════════════
     # STEP 5: Sort Results
     # ═══════════════════════════════════════════════════════════════
     sorted_commitments = sort_commitments(
-        filtered,
+        survivors,
         sort_by=filters.sort_by,
-        sort_order=filters.sort_order
+        sort_order=filters.sort_order,
+        today=today
     )
     
     # ═══════════════════════════════════════════════════════════════
-    # STEP 6: Categorize Results
-    # ═══════════════════════════════════════════════════════════════
-    categorized = categorize_commitments(sorted_commitments, today)
-    
-    # ═══════════════════════════════════════════════════════════════
-    # STEP 7: Build Response
+    # STEP 6: Build Response
     # ═══════════════════════════════════════════════════════════════
     query_description = filters.describe()
     
@@ -143,17 +202,17 @@ def fetch_commitments(
         filter_type = determine_filter_type(filters)
         return create_empty_result(
             query_description=query_description,
-            filters_applied=filters.to_dict(),
+            filters_applied=filters_dict,
             user_id=user_id,
             filter_type=filter_type
         )
     
-    # Convert to CommitmentItem objects
-    all_items = [CommitmentItem.from_firestore(c) for c in sorted_commitments]
+    # Convert and categorize in one pass
+    all_items, categorized = categorize_commitments(sorted_commitments, today)
     
     # Build summary
     summary = CommitmentSummary(
-        total=len(sorted_commitments),
+        total=len(all_items),
         overdue=len(categorized["overdue"]),
         due_today=len(categorized["due_today"]),
         upcoming=len(categorized["upcoming"]),
@@ -164,27 +223,37 @@ def fetch_commitments(
     
     return CommitmentResult(
         query_description=query_description,
-        filters_applied=filters.to_dict(),
-        total_found=len(sorted_commitments),
+        filters_applied=filters_dict,
+        total_found=len(all_items),
         summary=summary,
-        overdue=[CommitmentItem.from_firestore(c) for c in categorized["overdue"]],
-        due_today=[CommitmentItem.from_firestore(c) for c in categorized["due_today"]],
-        upcoming=[CommitmentItem.from_firestore(c) for c in categorized["upcoming"]],
-        later=[CommitmentItem.from_firestore(c) for c in categorized["later"]],
-        no_deadline=[CommitmentItem.from_firestore(c) for c in categorized["no_deadline"]],
-        completed=[CommitmentItem.from_firestore(c) for c in categorized["completed"]],
         all_commitments=all_items,
         user_id=user_id,
+        **categorized,
     )
 
 
+def apply_server_filters(query, filters: CommitmentFilters):
+    """
+    Add Firestore where clauses for filters the index can answer exactly
+    (see CommitmentFilters.to_firestore_clauses).
+    
+    apply_filters() still runs afterwards, so anything pushed here is only
+    a pre-filter - it just keeps non-matching docs off the wire.
+    """
+    for field_path, op, value in filters.to_firestore_clauses(HAS_DEADLINE_INDEXED):
+        query = query.where(field_path, op, value)
+    return query
+
+
 def apply_filters(
     commitments: List[Dict[str, Any]],
     filters: CommitmentFilters,
     today: date
 ) -> List[Dict[str, Any]]:
     """
-    Apply Python-side filters to commitments.
+    Apply all Python-side filters to commitments.
+    
+    Commitments must already have their status recalculated.
     
     Args:
         commitments: Raw commitment dicts from Firestore
@@ -194,143 +263,180 @@ def apply_filters(
     Returns:
         Filtered list of commitments
     """
-    result = commitments
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Status filter
-    # ─────────────────────────────────────────────────────────────────
-    if filters.status:
-        result = [c for c in result if c.get("status") in filters.status]
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Sender email filter (partial match, case-insensitive)
-    # ─────────────────────────────────────────────────────────────────
-    if filters.sender_email:
-        search = filters.sender_email.lower()
-        result = [
-            c for c in result
-            if search in (c.get("email_sender") or "").lower()
-            or search in (c.get("given_by") or "").lower()
-        ]
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Sender name filter (partial match, case-insensitive)
-    # ─────────────────────────────────────────────────────────────────
-    if filters.sender_name:
-        search = filters.sender_name.lower()
-        result = [
-            c for c in result
-            if search in (c.get("email_sender_name") or "").lower()
-        ]
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Sender role filter
-    # ─────────────────────────────────────────────────────────────────
-    if filters.sender_role:
-        roles = [r.lower() for r in filters.sender_role]
-        result = [
-            c for c in result
-            if (c.get("sender_role") or "unknown").lower() in roles
-        ]
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Direction filter (PHASE 3 - NEW)
-    # ─────────────────────────────────────────────────────────────────
-    if filters.direction:
-        directions = [d.lower() for d in filters.direction]
-        result = [
-            c for c in result
-            if (c.get("direction") or "incoming").lower() in directions
-        ]
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Assigned to me filter (PHASE 3 - NEW)
-    # ─────────────────────────────────────────────────────────────────
-    if filters.assigned_to_me is True:
-        result = [c for c in result if c.get("assigned_to_me") is True]
-    elif filters.assigned_to_me is False:
-        result = [c for c in result if c.get("assigned_to_me") is False]
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Created date filters
-    # ─────────────────────────────────────────────────────────────────
-    if filters.created_after:
-        result = [
-            c for c in result
-            if parse_datetime(c.get("created_at")) and parse_datetime(c.get("created_at")) >= filters.created_after
-        ]
-    
-    if filters.created_before:
-        result = [
-            c for c in result
-            if parse_datetime(c.get("created_at")) and parse_datetime(c.get("created_at")) <= filters.created_before
-        ]
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Deadline date filters
-    # ─────────────────────────────────────────────────────────────────
-    if filters.deadline_after:
-        result = [
-            c for c in result
-            if c.get("deadline_iso") and parse_date(c.get("deadline_iso")) and parse_date(c.get("deadline_iso")) >= filters.deadline_after
-        ]
-    
-    if filters.deadline_before:
-        result = [
-            c for c in result
-            if c.get("deadline_iso") and parse_date(c.get("deadline_iso")) and parse_date(c.get("deadline_iso")) <= filters.deadline_before
-        ]
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Has deadline filter
-    # ─────────────────────────────────────────────────────────────────
-    if filters.has_deadline is True:
-        result = [c for c in result if c.get("deadline_iso")]
-    elif filters.has_deadline is False:
-        result = [c for c in result if not c.get("deadline_iso")]
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Priority filter
-    # ─────────────────────────────────────────────────────────────────
-    if filters.priority:
-        priorities = [p.lower() for p in filters.priority]
-        result = [
-            c for c in result
-            if (c.get("priority") or "medium").lower() in priorities
-        ]
-    
-    # ─────────────────────────────────────────────────────────────────
-    # Commitment type filter
-    # ─────────────────────────────────────────────────────────────────
-    if filters.commitment_type:
-        types = [t.lower() for t in filters.commitment_type]
-        result = [
-            c for c in result
-            if (c.get("commitment_type") or "general").lower() in types
-        ]
+    return list(apply_status_dependent_filters(
+        apply_status_independent_filters(commitments, filters, today),
+        filters
+    ))
+
+
+def apply_status_dependent_filters(
+    commitments: Iterable[Dict[str, Any]],
+    filters: CommitmentFilters
+) -> Iterable[Dict[str, Any]]:
+    """
+    Filter on the recalculated status (run after recalculate_status).
+    Lazy: returns an iterator when a status filter is active.
+    """
+    status = filters.status_set
+    if not status:
+        return commitments
+    return (c for c in commitments if c.get("status") in status)
+
+
+def apply_status_independent_filters(
+    commitments: List[Dict[str, Any]],
+    filters: CommitmentFilters,
+    today: date
+) -> List[Dict[str, Any]]:
+    """
+    Apply every filter that only reads stored fields (everything but status).
     
-    # ─────────────────────────────────────────────────────────────────
-    # Text search (in 'what' and 'email_subject', case-insensitive)
-    # ─────────────────────────────────────────────────────────────────
-    if filters.search_text:
-        search = filters.search_text.lower()
-        result = [
-            c for c in result
-            if search in (c.get("what") or "").lower()
-            or search in (c.get("email_subject") or "").lower()
-        ]
+    Safe to run before recalculate_status, so status only has to be
+    recalculated for the commitments that survive. All active filters are
+    checked in a single pass by a predicate compiled for exactly those filters.
+    """
+    values = _predicate_values(filters)
+    shape = tuple(values[name] is not None for name in _PREDICATE_CLAUSES)
+    if not any(shape):
+        return commitments
+    
+    passes = _predicate_factory(shape)(**values)
+    return [c for c in commitments if passes(c)]
+
+
+def _predicate_values(filters: CommitmentFilters) -> Dict[str, Any]:
+    """Every filter value the predicate reads, normalized; None = filter inactive."""
+    return {
+        "assigned_to_me": filters.assigned_to_me,                                           # PHASE 3
+        "has_deadline": filters.has_deadline,
+        "directions": filters.direction_set,                                                # PHASE 3
+        "roles": filters.sender_role_set,
+        "priorities": filters.priority_set,
+        "types": filters.commitment_type_set,
+        "deadline_after": filters.deadline_after,
+        "deadline_before": filters.deadline_before,
+        "sender_email": filters.sender_email.lower() if filters.sender_email else None,
+        "sender_name": filters.sender_name.lower() if filters.sender_name else None,
+        "search": filters.search_text.lower() if filters.search_text else None,
+        "created_after": filters.created_after,
+        "created_before": filters.created_before,
+    }
+
+
+# Predicate source per filter, in evaluation order, so the costly checks see the
+# fewest docs:
+#   1. plain bool comparisons
+#   2. set membership, most selective first (priority/role/type have several
+#      values, direction only two)
+#   3. the memoized deadline parse + range
+#   4. substring scans on the search blobs
+#   5. the uncached created_at parse + range
+# Status isn't here: it's filtered after recalculate_status.
+# Enumerated fields are stored lowercase (save_commitment normalizes them);
+# only legacy mixed-case values pay for a .lower() copy.
+_PREDICATE_CLAUSES = {
+    "assigned_to_me": """
+        if c.get("assigned_to_me") is not assigned_to_me:
+            return False""",
+    "has_deadline": """
+        if bool(c.get("deadline_iso")) is not has_deadline:
+            return False""",
+    "priorities": """
+        value = c.get("priority") or "medium"
+        if (value if value.islower() else value.lower()) not in priorities:
+            return False""",
+    "roles": """
+        value = c.get("sender_role") or "unknown"
+        if (value if value.islower() else value.lower()) not in roles:
+            return False""",
+    "types": """
+        value = c.get("commitment_type") or "general"
+        if (value if value.islower() else value.lower()) not in types:
+            return False""",
+    "directions": """
+        value = c.get("direction") or "incoming"
+        if (value if value.islower() else value.lower()) not in directions:
+            return False""",
+    "deadline_after": """
+        if deadline < deadline_after:
+            return False""",
+    "deadline_before": """
+        if deadline > deadline_before:
+            return False""",
+    "sender_email": """
+        if sender_email not in search_blob(c, "sender_email_blob"):
+            return False""",
+    "sender_name": """
+        if sender_name not in search_blob(c, "sender_name_blob"):
+            return False""",
+    "search": """
+        if search not in search_blob(c, "search_blob"):
+            return False""",
+    "created_after": """
+        if created_at < created_after:
+            return False""",
+    "created_before": """
+        if created_at > created_before:
+            return False""",
+}
+
+# Each date field is parsed once, before its first bound check
+_PREDICATE_PARSES = {
+    "deadline_after": """
+        deadline = parse_date(c.get("deadline_iso"))
+        if deadline is None:
+            return False""",
+    "created_after": """
+        created_at = parse_datetime(c.get("created_at"))
+        if created_at is None:
+            return False""",
+}
+_PREDICATE_PARSES["deadline_before"] = _PREDICATE_PARSES["deadline_after"]
+_PREDICATE_PARSES["created_before"] = _PREDICATE_PARSES["created_after"]
+
+
+@lru_cache(maxsize=256)
+def _predicate_factory(shape: Tuple[bool, ...]):
+    """
+    Compile a predicate factory for one combination of active filters.
     
-    return result
+    Only the active clauses are emitted, so inactive filters cost nothing per
+    doc. Filter values are passed to the factory as arguments, never pasted
+    into the source, so one compiled factory serves every fetch with the same shape.
+    """
+    names = list(_PREDICATE_CLAUSES)
+    active = [name for name, on in zip(names, shape) if on]
+    body = []
+    for name in active:
+        parse = _PREDICATE_PARSES.get(name)
+        if parse and parse not in body:
+            body.append(parse)
+        body.append(_PREDICATE_CLAUSES[name])
+    
+    source = (
+        f"def make_predicate({', '.join(names)}):\n"
+        f"    def passes(c):{''.join(body)}\n"
+        f"        return True\n"
+        f"    return passes\n"
+    )
+    namespace = {}
+    exec(
+        compile(source, "<commitment predicate>", "exec"),
+        {"parse_date": parse_date, "parse_datetime": parse_datetime, "search_blob": search_blob},
+        namespace,
+    )
+    return namespace["make_predicate"]
 
 
 def categorize_commitments(
     commitments: List[Dict[str, Any]],
     today: date
-) -> Dict[str, List[Dict[str, Any]]]:
+) -> Tuple[List[CommitmentItem], Dict[str, List[CommitmentItem]]]:
     """
-    Categorize commitments into groups.
+    Convert commitments to CommitmentItems and categorize them in one pass.
     
-    Returns dict with keys: overdue, due_today, upcoming, later, no_deadline, completed
+    Returns (all_items, categories) where categories has keys:
+    overdue, due_today, upcoming, later, no_deadline, completed
     """
     categories = {
         "overdue": [],
@@ -340,17 +446,41 @@ def categorize_commitments(
         "no_deadline": [],
         "completed": [],
     }
+    all_items = []
     
     for c in commitments:
+        item = CommitmentItem.from_firestore(c)
+        all_items.append(item)
         if c.get("completed"):
-            categories["completed"].append(c)
+            categories["completed"].append(item)
         else:
-            category = categorize_by_deadline(c, today, UPCOMING_DAYS)
-            categories[category].append(c)
+            categories[categorize_by_deadline(c, today, UPCOMING_DAYS)].append(item)
     
-    return categories
+    return all_items, categories
 
 
+def build_search_blobs(doc: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Lowercased text blobs for the partial-match filters, stored on the doc at write
+    time so each filter is one substring scan instead of one .lower() per field.
+    Fields are joined with a newline so a search term can't match across them.
+    """
+    return {
+        name: "\n".join(doc.get(f) or "" for f in fields).lower()
+        for name, fields in SEARCH_BLOB_FIELDS.items()
+    }
+
+
+def search_blob(c: Dict[str, Any], name: str) -> str:
+    """Stored search blob, or build it for docs saved before blobs existed."""
+    blob = c.get(name)
+    if blob is None:
+        blob = "\n".join(c.get(f) or "" for f in SEARCH_BLOB_FIELDS[name]).lower()
+    return blob
+
+
+# created_at timestamps are near-unique and would only churn a cache, so unlike
+# parse_date (shared parse_iso_date cache) this stays uncached.
 def parse_datetime(value: Any) -> Optional[datetime]:
     """Parse datetime from string or return None."""
     if not value:
@@ -359,7 +489,7 @@ def parse_datetime(value: Any) -> Optional[datetime]:
         return value
     if isinstance(value, str):
         try:
-            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+            return parse_iso_datetime(value)
         except ValueError:
             return None
     return None
@@ -374,11 +504,7 @@ def parse_date(value: Any) -> Optional[date]:
     if isinstance(value, datetime):
         return value.date()
     if isinstance(value, str):
-        try:
-            # Handle both "2025-11-22" and "2025-11-22T00:00:00Z" formats
-            return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
-        except ValueError:
-            return None
+        return parse_iso_date(value)
     return None
 
 
@@ -407,36 +533,36 @@ def determine_filter_type(filters: CommitmentFilters) -> str:
 # CONVENIENCE FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
 
+# Fixed filters for the convenience fetchers, built once and shared.
+# fetch_commitments never mutates its filters, so sharing is safe.
+_ALL_ACTIVE_FILTERS = CommitmentFilters()
+_OVERDUE_FILTERS = CommitmentFilters(status=["overdue"])
+_DUE_TODAY_FILTERS = CommitmentFilters(status=["due_today"])
+_URGENT_FILTERS = CommitmentFilters(status=["overdue", "due_today"])
+_FROM_INVESTORS_FILTERS = CommitmentFilters(sender_role=["investor"])
+_FROM_CUSTOMERS_FILTERS = CommitmentFilters(sender_role=["customer"])
+_HIGH_PRIORITY_FILTERS = CommitmentFilters(priority=["high"])
+_COMPLETED_FILTERS = CommitmentFilters(only_completed=True)
+
+
 def fetch_all_active(user_id: str, db=None) -> CommitmentResult:
     """Fetch all active (non-completed) commitments."""
-    return fetch_commitments(user_id, CommitmentFilters(), db)
+    return fetch_commitments(user_id, _ALL_ACTIVE_FILTERS, db)
 
 
 def fetch_overdue(user_id: str, db=None) -> CommitmentResult:
     """Fetch only overdue commitments."""
-    return fetch_commitments(
-        user_id,
-        CommitmentFilters(status=["overdue"]),
-        db
-    )
+    return fetch_commitments(user_id, _OVERDUE_FILTERS, db)
 
 
 def fetch_due_today(user_id: str, db=None) -> CommitmentResult:
     """Fetch only commitments due today."""
-    return fetch_commitments(
-        user_id,
-        CommitmentFilters(status=["due_today"]),
-        db
-    )
+    return fetch_commitments(user_id, _DUE_TODAY_FILTERS, db)
 
 
 def fetch_urgent(user_id: str, db=None) -> CommitmentResult:
     """Fetch overdue + due today commitments."""
-    return fetch_commitments(
-        user_id,
-        CommitmentFilters(status=["overdue", "due_today"]),
-        db
-    )
+    return fetch_commitments(user_id, _URGENT_FILTERS, db)
 
 
 def fetch_from_sender(user_id: str, sender_email: str, db=None) -> CommitmentResult:
@@ -459,44 +585,27 @@ def fetch_by_search(user_id: str, search_text: str, db=None) -> CommitmentResult
 
 def fetch_from_investors(user_id: str, db=None) -> CommitmentResult:
     """Fetch commitments from investors."""
-    return fetch_commitments(
-        user_id,
-        CommitmentFilters(sender_role=["investor"]),
-        db
-    )
+    return fetch_commitments(user_id, _FROM_INVESTORS_FILTERS, db)
 
 
 def fetch_from_customers(user_id: str, db=None) -> CommitmentResult:
     """Fetch commitments from customers."""
-    return fetch_commitments(
-        user_id,
-        CommitmentFilters(sender_role=["customer"]),
-        db
-    )
+    return fetch_commitments(user_id, _FROM_CUSTOMERS_FILTERS, db)
 
 
 def fetch_high_priority(user_id: str, db=None) -> CommitmentResult:
     """Fetch high priority commitments."""
-    return fetch_commitments(
-        user_id,
-        CommitmentFilters(priority=["high"]),
-        db
-    )
+    return fetch_commitments(user_id, _HIGH_PRIORITY_FILTERS, db)
 
 
 def fetch_completed(user_id: str, db=None) -> CommitmentResult:
     """Fetch completed commitments."""
-    return fetch_commitments(
-        user_id,
-        CommitmentFilters(only_completed=True),
-        db
-    )
+    return fetch_commitments(user_id, _COMPLETED_FILTERS, db)
 
 
 def fetch_created_today(user_id: str, db=None) -> CommitmentResult:
     """Fetch commitments created today."""
-    today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-    today_end = today_start + timedelta(days=1)
+    _, today_start, today_end = today_bounds()
     return fetch_commitments(
         user_id,
         CommitmentFilters(created_after=today_start, created_before=today_end),
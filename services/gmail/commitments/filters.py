@@ -6,16 +6,60 @@ Multiple filters are combined with AND logic.
 """
 
 from __future__ import annotations
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Optional, Sequence, Tuple
 from datetime import date, datetime, timezone, timedelta
 
 
-@dataclass
+# List-valued filters (stored as tuples on the frozen dataclass) -> whether the
+# membership set is lowercased (status values are always written lowercase)
+_LIST_FIELDS = {
+    "status": False,
+    "sender_role": True,
+    "direction": True,
+    "priority": True,
+    "commitment_type": True,
+}
+
+# Boolean spellings accepted for assigned_to_me from loosely-typed tool arguments
+_BOOL_STRINGS = {"true": True, "false": False}
+
+# Max values in a Firestore "in" clause
+FIRESTORE_IN_LIMIT = 10
+
+# List filters that can run in Firestore: field -> default the fetcher assumes when
+# the field is missing. Only fields whose writers validate the stored value are listed
+# (sender_role/priority/commitment_type are raw LLM output on legacy docs and may
+# differ in case), and only filters that exclude the default are pushed, since docs
+# written before the field existed don't match a server-side clause.
+SERVER_SIDE_LIST_FILTERS = {
+    "direction": "incoming",
+}
+
+
+def _is_aware(value: Optional[datetime]) -> bool:
+    """True for timezone-aware datetimes (stored created_at strings are UTC)."""
+    return value is not None and value.tzinfo is not None
+
+
+@lru_cache(maxsize=256)
+def _frozen(values: Tuple[str, ...], lower: bool) -> FrozenSet[str]:
+    """Membership set for a list filter, shared by every filter with the same values."""
+    if lower:
+        return frozenset(sys.intern(v.lower()) for v in values)
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
 class CommitmentFilters:
     """
     Filter configuration for fetching commitments.
     
+    Immutable and hashable: list filters are stored as tuples, so an instance
+    can be shared (presets) and used directly as a cache key.
+    
     Usage:
         # Show all active
         filters = CommitmentFilters()
@@ -37,19 +81,19 @@ class CommitmentFilters:
     # COMMITMENT STATUS (recalculated based on today)
     # ═══════════════════════════════════════════════════════════════
     # Options: "overdue", "due_today", "active", "no_deadline"
-    status: Optional[List[str]] = None
+    status: Optional[Sequence[str]] = None
     
     # ═══════════════════════════════════════════════════════════════
     # SENDER FILTERS
     # ═══════════════════════════════════════════════════════════════
     sender_email: Optional[str] = None       # Partial match: "sarah@" or "sequoia.com"
     sender_name: Optional[str] = None        # Partial match: "Sarah" or "Chen"
-    sender_role: Optional[List[str]] = None  # ["investor", "customer", "teammate", "unknown"]
+    sender_role: Optional[Sequence[str]] = None  # ["investor", "customer", "teammate", "unknown"]
     
     # ═══════════════════════════════════════════════════════════════
     # DIRECTION FILTERS (PHASE 3 - NEW)
     # ═══════════════════════════════════════════════════════════════
-    direction: Optional[List[str]] = None    # ["incoming", "outgoing"]
+    direction: Optional[Sequence[str]] = None    # ["incoming", "outgoing"]
     assigned_to_me: Optional[bool] = None    # True = user must do it, False = others must do it
     
     # ═══════════════════════════════════════════════════════════════
@@ -68,8 +112,8 @@ class CommitmentFilters:
     # ═══════════════════════════════════════════════════════════════
     # PRIORITY & TYPE
     # ═══════════════════════════════════════════════════════════════
-    priority: Optional[List[str]] = None          # ["high", "medium", "low"]
-    commitment_type: Optional[List[str]] = None   # ["deliverable", "meeting", "call", ...]
+    priority: Optional[Sequence[str]] = None          # ["high", "medium", "low"]
+    commitment_type: Optional[Sequence[str]] = None   # ["deliverable", "meeting", "call", ...]
     
     # ═══════════════════════════════════════════════════════════════
     # TEXT SEARCH (searches in 'what' and 'email_subject')
@@ -83,24 +127,139 @@ class CommitmentFilters:
     sort_order: str = "asc"                  # "asc", "desc"
     limit: int = 100                         # Max results
     
+    # ═══════════════════════════════════════════════════════════════
+    # MEMBERSHIP SETS (None = filter inactive)
+    # Built once in __post_init__ from interned values; the fields are frozen.
+    # ═══════════════════════════════════════════════════════════════
+    @property
+    def status_set(self) -> Optional[FrozenSet[str]]:
+        return self._status_set
+    
+    @property
+    def sender_role_set(self) -> Optional[FrozenSet[str]]:
+        return self._sender_role_set
+    
+    @property
+    def direction_set(self) -> Optional[FrozenSet[str]]:
+        return self._direction_set
+    
+    @property
+    def priority_set(self) -> Optional[FrozenSet[str]]:
+        return self._priority_set
+    
+    @property
+    def commitment_type_set(self) -> Optional[FrozenSet[str]]:
+        return self._commitment_type_set
+    
+    # ═══════════════════════════════════════════════════════════════
+    # SERVER-SIDE (FIRESTORE) CLAUSES
+    # ═══════════════════════════════════════════════════════════════
+    def to_firestore_clauses(self, has_deadline_indexed: bool = False) -> List[Tuple[str, str, Any]]:
+        """
+        (field_path, op, value) where clauses for the filters Firestore can answer.
+        
+        The completed clause is added by the fetcher. Status is never pushed:
+        the stored value is stale until recalculated. Composite indexes needed
+        (each on top of completed ASC):
+            deadline_iso ASC, created_at ASC   - range filters
+            direction ASC / assigned_to_me ASC - combined with a range filter
+            has_deadline ASC                   - when has_deadline_indexed
+        """
+        clauses = []
+        
+        for field_name, default in SERVER_SIDE_LIST_FILTERS.items():
+            values = getattr(self, f"{field_name}_set")
+            if not values or default in values or len(values) > FIRESTORE_IN_LIMIT:
+                continue
+            values = sorted(values)
+            if len(values) == 1:
+                clauses.append((field_name, "==", values[0]))
+            else:
+                clauses.append((field_name, "in", values))
+        
+        # Exact match in the fetcher too (docs without the field never match)
+        if self.assigned_to_me is not None:
+            clauses.append(("assigned_to_me", "==", self.assigned_to_me))
+        
+        if has_deadline_indexed and self.has_deadline is not None:
+            clauses.append(("has_deadline", "==", self.has_deadline))
+        
+        # One range per query: deadline is usually the more selective one.
+        # Both fields are stored as ISO strings, which sort chronologically.
+        if self.deadline_after or self.deadline_before:
+            # deadline_iso may be "2025-11-22" or "2025-11-22T00:00:00Z", so the
+            # upper bound is "< next day" rather than "<= day"
+            if self.deadline_after:
+                clauses.append(("deadline_iso", ">=", self.deadline_after.isoformat()))
+            if self.deadline_before:
+                clauses.append(("deadline_iso", "<", (self.deadline_before + timedelta(days=1)).isoformat()))
+        elif _is_aware(self.created_after) or _is_aware(self.created_before):
+            if _is_aware(self.created_after):
+                clauses.append(("created_at", ">=", self.created_after.astimezone(timezone.utc).isoformat()))
+            if _is_aware(self.created_before):
+                clauses.append(("created_at", "<=", self.created_before.astimezone(timezone.utc).isoformat()))
+        
+        return clauses
+    
+    def __post_init__(self):
+        # Lists passed by callers become tuples of interned strings (frozen +
+        # hashable), and each list gets its membership set up front
+        for name, lower in _LIST_FIELDS.items():
+            value = getattr(self, name)
+            if value is not None:
+                # Tool arguments aren't strictly validated: a bare string is one
+                # value, and non-str items are dropped
+                if isinstance(value, str):
+                    value = (value,)
+                value = tuple(sys.intern(v) for v in value if isinstance(v, str))
+                object.__setattr__(self, name, value)
+            object.__setattr__(self, f"_{name}_set", _frozen(value, lower) if value else None)
+        
+        # Matched by identity against stored booleans, so it must be a real bool
+        # ("true"/"false" strings from tool calls included; unknown strings -> no filter)
+        assigned = self.assigned_to_me
+        if assigned is not None and not isinstance(assigned, bool):
+            if isinstance(assigned, str):
+                assigned = _BOOL_STRINGS.get(assigned.strip().lower())
+            else:
+                assigned = bool(assigned)
+            object.__setattr__(self, "assigned_to_me", assigned)
+    
+    # ═══════════════════════════════════════════════════════════════
+    # MEMOIZED to_dict() / describe()
+    # Safe because the instance is frozen; stored straight in __dict__
+    # ═══════════════════════════════════════════════════════════════
     def to_dict(self) -> dict:
-        """Convert filters to dictionary for logging/debugging."""
+        """Convert filters to dictionary for logging/debugging (shared - don't mutate)."""
+        cached = self.__dict__.get("_dict_cache")
+        if cached is None:
+            cached = self.__dict__["_dict_cache"] = self._build_dict()
+        return cached
+    
+    def describe(self) -> str:
+        """Generate human-readable description of applied filters."""
+        cached = self.__dict__.get("_describe_cache")
+        if cached is None:
+            cached = self.__dict__["_describe_cache"] = self._build_description()
+        return cached
+    
+    def _build_dict(self) -> dict:
         result = {}
         if self.include_completed:
             result["include_completed"] = True
         if self.only_completed:
             result["only_completed"] = True
         if self.status:
-            result["status"] = self.status
+            result["status"] = list(self.status)
         if self.sender_email:
             result["sender_email"] = self.sender_email
         if self.sender_name:
             result["sender_name"] = self.sender_name
         if self.sender_role:
-            result["sender_role"] = self.sender_role
+            result["sender_role"] = list(self.sender_role)
         # PHASE 3 - NEW
         if self.direction:
-            result["direction"] = self.direction
+            result["direction"] = list(self.direction)
         if self.assigned_to_me is not None:
             result["assigned_to_me"] = self.assigned_to_me
         # END PHASE 3
@@ -115,9 +274,9 @@ class CommitmentFilters:
         if self.has_deadline is not None:
             result["has_deadline"] = self.has_deadline
         if self.priority:
-            result["priority"] = self.priority
+            result["priority"] = list(self.priority)
         if self.commitment_type:
-            result["commitment_type"] = self.commitment_type
+            result["commitment_type"] = list(self.commitment_type)
         if self.search_text:
             result["search_text"] = self.search_text
         result["sort_by"] = self.sort_by
@@ -125,8 +284,7 @@ class CommitmentFilters:
         result["limit"] = self.limit
         return result
     
-    def describe(self) -> str:
-        """Generate human-readable description of applied filters."""
+    def _build_description(self) -> str:
         parts = []
         
         if self.only_completed:
@@ -13,8 +13,43 @@ Status values:
 """
 
 from __future__ import annotations
+import sys
 from datetime import date, datetime, timezone, timedelta
-from typing import Dict, Any, Tuple
+from functools import lru_cache, partial
+from operator import methodcaller
+from typing import Dict, Any, Optional, Tuple
+
+
+# Sort-key constants (built once, not per key call)
+PRIORITY_SCORES = {
+    "high": 0,
+    "medium": 1,
+    "low": 2,
+}
+_MIN_DATETIME = datetime.min.replace(tzinfo=timezone.utc)
+_days_overdue_key = methodcaller("get", "days_overdue", 0)
+
+
+if sys.version_info >= (3, 11):
+    parse_iso_datetime = datetime.fromisoformat  # Accepts a trailing "Z" natively
+else:
+    def parse_iso_datetime(value: str) -> datetime:
+        # Only strings that actually end in "Z" pay for a rewritten copy
+        return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+
+
+# Deadlines cluster on a few dates (EOD/EOW/EOM), so repeat strings are common.
+# Shared with the fetcher's filters so both parse each string once.
+@lru_cache(maxsize=1024)
+def parse_iso_date(value: str) -> Optional[date]:
+    """
+    Parse an ISO date string (memoized by string); None if invalid.
+    Handles both "2025-11-22" and "2025-11-22T00:00:00Z".
+    """
+    try:
+        return parse_iso_datetime(value).date()
+    except ValueError:
+        return None
 
 
 def recalculate_status(commitment: Dict[str, Any], today: date = None) -> Dict[str, Any]:
@@ -50,8 +85,7 @@ def recalculate_status(commitment: Dict[str, Any], today: date = None) -> Dict[s
         try:
             # Parse deadline date
             if isinstance(deadline_iso, str):
-                # Handle both "2025-11-22" and "2025-11-22T00:00:00Z" formats
-                deadline_date = datetime.fromisoformat(deadline_iso.replace('Z', '+00:00')).date()
+                deadline_date = parse_iso_date(deadline_iso)
             elif isinstance(deadline_iso, date):
                 deadline_date = deadline_iso
             else:
@@ -117,7 +151,7 @@ def categorize_by_deadline(
         if deadline_iso:
             try:
                 if isinstance(deadline_iso, str):
-                    deadline_date = datetime.fromisoformat(deadline_iso.replace('Z', '+00:00')).date()
+                    deadline_date = parse_iso_date(deadline_iso)
                 else:
                     deadline_date = deadline_iso
                 
@@ -169,7 +203,7 @@ def get_urgency_score(commitment: Dict[str, Any], today: date = None) -> int:
     elif status == "active" and deadline_iso:
         try:
             if isinstance(deadline_iso, str):
-                deadline_date = datetime.fromisoformat(deadline_iso.replace('Z', '+00:00')).date()
+                deadline_date = parse_iso_date(deadline_iso)
             else:
                 deadline_date = deadline_iso
             
@@ -196,61 +230,64 @@ def get_priority_score(priority: str) -> int:
     Returns:
         Score: high=0, medium=1, low=2
     """
-    priority_map = {
-        "high": 0,
-        "medium": 1,
-        "low": 2,
-    }
-    return priority_map.get(priority.lower(), 1)
+    return PRIORITY_SCORES.get(priority if priority.islower() else priority.lower(), 1)
+
+
+def _created_at_key(c: Dict[str, Any]) -> datetime:
+    created = c.get("created_at", "")
+    if isinstance(created, str):
+        try:
+            return parse_iso_datetime(created)
+        except ValueError:
+            return _MIN_DATETIME
+    return _MIN_DATETIME
+
+
+def _urgency_key(today: date):
+    # Bind today once instead of each key call resolving datetime.now()
+    return partial(get_urgency_score, today=today)
+
+
+def _priority_then_deadline_key(today: date):
+    def priority_then_deadline(c):
+        return (get_priority_score(c.get("priority", "medium")), get_urgency_score(c, today))
+    return priority_then_deadline
+
+
+# sort_by -> (key factory taking today, whether the requested order is flipped).
+# Resolved with one dict lookup per sort; unknown values sort by deadline urgency.
+_SORT_KEYS = {
+    "deadline": (_urgency_key, False),                                  # Urgency score (status + deadline)
+    "priority": (_priority_then_deadline_key, False),                   # Priority, then deadline
+    "created_at": (lambda today: _created_at_key, False),
+    "days_overdue": (lambda today: _days_overdue_key, True),            # Most overdue first by default
+}
 
 
 def sort_commitments(
     commitments: list,
     sort_by: str = "deadline",
-    sort_order: str = "asc"
+    sort_order: str = "asc",
+    today: date = None
 ) -> list:
     """
     Sort commitments by specified field.
     
     Args:
-        commitments: List of commitment dicts
+        commitments: Commitment dicts (any iterable - consumed once)
         sort_by: Field to sort by ("deadline", "created_at", "priority", "days_overdue")
         sort_order: "asc" or "desc"
+        today: Date urgency is measured against (defaults to today)
     
     Returns:
         Sorted list of commitments
     """
-    reverse = sort_order.lower() == "desc"
-    
-    if sort_by == "deadline":
-        # Sort by urgency score (combines status + deadline)
-        return sorted(commitments, key=get_urgency_score, reverse=reverse)
-    
-    elif sort_by == "priority":
-        # Sort by priority, then by deadline
-        def priority_then_deadline(c):
-            return (get_priority_score(c.get("priority", "medium")), get_urgency_score(c))
-        return sorted(commitments, key=priority_then_deadline, reverse=reverse)
-    
-    elif sort_by == "created_at":
-        def created_at_key(c):
-            created = c.get("created_at", "")
-            if isinstance(created, str):
-                try:
-                    return datetime.fromisoformat(created.replace('Z', '+00:00'))
-                except ValueError:
-                    return datetime.min.replace(tzinfo=timezone.utc)
-            return datetime.min.replace(tzinfo=timezone.utc)
-        return sorted(commitments, key=created_at_key, reverse=reverse)
-    
-    elif sort_by == "days_overdue":
-        def days_key(c):
-            return c.get("days_overdue", 0)
-        return sorted(commitments, key=days_key, reverse=not reverse)  # Most overdue first by default
-    
-    else:
-        # Default: by deadline urgency
-        return sorted(commitments, key=get_urgency_score, reverse=reverse)
+    if today is None:
+        today = datetime.now(timezone.utc).date()
+    
+    make_key, flip = _SORT_KEYS.get(sort_by, _SORT_KEYS["deadline"])
+    reverse = (sort_order.lower() == "desc") != flip
+    return sorted(commitments, key=make_key(today), reverse=reverse)
 
 
 if __name__ == "__main__":
@@ -17,6 +17,13 @@ from typing import Dict, Any
 
 from firebase_admin import firestore
 
+from services.gmail.commitments.fetcher import build_search_blobs, bump_commitments_version
+
+
+# Enumerated fields the fetcher matches case-insensitively; storing them
+# lowercase lets it compare without lowercasing on every read
+LOWERCASE_FIELDS = ("sender_role", "priority", "commitment_type", "direction")
+
 
 def _make_commitment_id() -> str:
     """Generate a unique commitment ID using random UUID."""
@@ -42,9 +49,17 @@ def save_commitment_to_firestore(user_id: str, doc: Dict[str, Any]) -> str | boo
     doc["created_at"] = now_iso
     doc["updated_at"] = now_iso
 
+    for field in LOWERCASE_FIELDS:
+        value = doc.get(field)
+        if isinstance(value, str):
+            doc[field] = value.lower()
+    doc.update(build_search_blobs(doc))
+    doc["has_deadline"] = bool(doc.get("deadline_iso"))  # Indexed equality filter for the fetcher
+
     try:
         # Always create new document (no deduplication with random IDs)
         doc_ref.set(doc)
+        bump_commitments_version(user_id)
         return commitment_id
     except Exception as e:
         print(f"Firestore save error: {e}")
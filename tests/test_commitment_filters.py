@@ -0,0 +1,47 @@
+"""
+CommitmentFilters normalization tests.
+
+Run: python -m unittest tests.test_commitment_filters
+"""
+
+import unittest
+from datetime import date
+
+from services.gmail.commitments.fetcher import apply_filters
+from services.gmail.commitments.filters import CommitmentFilters
+
+
+class AssignedToMeTests(unittest.TestCase):
+    """assigned_to_me is matched by identity, so it must end up a real bool or None."""
+
+    def test_bool_and_none_unchanged(self):
+        self.assertIs(CommitmentFilters(assigned_to_me=True).assigned_to_me, True)
+        self.assertIs(CommitmentFilters(assigned_to_me=False).assigned_to_me, False)
+        self.assertIsNone(CommitmentFilters().assigned_to_me)
+
+    def test_string_values_from_tool_calls(self):
+        self.assertIs(CommitmentFilters(assigned_to_me="true").assigned_to_me, True)
+        self.assertIs(CommitmentFilters(assigned_to_me=" False ").assigned_to_me, False)
+        self.assertIs(CommitmentFilters(assigned_to_me="TRUE").assigned_to_me, True)
+
+    def test_unknown_string_disables_the_filter(self):
+        self.assertIsNone(CommitmentFilters(assigned_to_me="maybe").assigned_to_me)
+
+    def test_other_values_use_truthiness(self):
+        self.assertIs(CommitmentFilters(assigned_to_me=1).assigned_to_me, True)
+        self.assertIs(CommitmentFilters(assigned_to_me=0).assigned_to_me, False)
+
+    def test_normalized_filters_are_equal(self):
+        self.assertEqual(CommitmentFilters(assigned_to_me="true"), CommitmentFilters(assigned_to_me=True))
+
+    def test_string_value_filters_like_bool(self):
+        commitments = [
+            {"commitment_id": "mine", "assigned_to_me": True},
+            {"commitment_id": "theirs", "assigned_to_me": False},
+        ]
+        result = apply_filters(commitments, CommitmentFilters(assigned_to_me="true"), date(2025, 11, 22))
+        self.assertEqual([c["commitment_id"] for c in result], ["mine"])
+
+
+if __name__ == "__main__":
+    unittest.main()
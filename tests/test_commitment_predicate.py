@@ -0,0 +1,224 @@
+"""
+Compiled commitment predicate and server-side clause tests.
+
+The fetcher checks every status-independent filter with one predicate compiled
+per combination of active filters. These tests compare it against the original
+per-field checks, one filter at a time and in combination, over docs with
+missing and None fields.
+
+Run: python -m unittest tests.test_commitment_predicate
+"""
+
+import itertools
+import random
+import unittest
+from datetime import date, datetime, timezone
+
+from services.gmail.commitments.fetcher import (
+    apply_status_independent_filters,
+    build_search_blobs,
+    parse_date,
+    parse_datetime,
+)
+from services.gmail.commitments.filters import CommitmentFilters
+
+
+TODAY = date(2025, 11, 22)
+
+
+# ════════════════════════════════════════════════════════════════
+# REFERENCE - the per-field checks the compiled predicate replaced
+# ════════════════════════════════════════════════════════════════
+
+def reference_passes(c, f):
+    if f.sender_email:
+        search = f.sender_email.lower()
+        if search not in (c.get("email_sender") or "").lower() and search not in (c.get("given_by") or "").lower():
+            return False
+    if f.sender_name and f.sender_name.lower() not in (c.get("email_sender_name") or "").lower():
+        return False
+    if f.sender_role and (c.get("sender_role") or "unknown").lower() not in [r.lower() for r in f.sender_role]:
+        return False
+    if f.direction and (c.get("direction") or "incoming").lower() not in [d.lower() for d in f.direction]:
+        return False
+    if f.assigned_to_me is True and c.get("assigned_to_me") is not True:
+        return False
+    if f.assigned_to_me is False and c.get("assigned_to_me") is not False:
+        return False
+    created_at = parse_datetime(c.get("created_at"))
+    if f.created_after and not (created_at and created_at >= f.created_after):
+        return False
+    if f.created_before and not (created_at and created_at <= f.created_before):
+        return False
+    deadline = parse_date(c.get("deadline_iso")) if c.get("deadline_iso") else None
+    if f.deadline_after and not (deadline and deadline >= f.deadline_after):
+        return False
+    if f.deadline_before and not (deadline and deadline <= f.deadline_before):
+        return False
+    if f.has_deadline is True and not c.get("deadline_iso"):
+        return False
+    if f.has_deadline is False and c.get("deadline_iso"):
+        return False
+    if f.priority and (c.get("priority") or "medium").lower() not in [p.lower() for p in f.priority]:
+        return False
+    if f.commitment_type and (c.get("commitment_type") or "general").lower() not in [t.lower() for t in f.commitment_type]:
+        return False
+    if f.search_text:
+        search = f.search_text.lower()
+        if search not in (c.get("what") or "").lower() and search not in (c.get("email_subject") or "").lower():
+            return False
+    return True
+
+
+# Per field: values a doc may hold (MISSING = key absent)
+MISSING = object()
+
+DOC_VALUES = {
+    "email_sender": ["sarah@sequoia.com", "Bob@Acme.io", None, MISSING],
+    "given_by": ["sarah@sequoia.com", None, MISSING],
+    "email_sender_name": ["Sarah Chen", "BOB", None, MISSING],
+    "sender_role": ["investor", "Customer", None, MISSING],
+    "direction": ["incoming", "outgoing", "Outgoing", None, MISSING],
+    "assigned_to_me": [True, False, None, MISSING],
+    "created_at": ["2025-11-21T09:00:00Z", "2025-11-23T18:30:00+00:00", "not a date", None, MISSING],
+    "deadline_iso": ["2025-11-20", "2025-11-22T00:00:00Z", "2025-11-29", "", "bad", None, MISSING],
+    "priority": ["high", "Medium", "low", None, MISSING],
+    "commitment_type": ["call", "Meeting", None, MISSING],
+    "what": ["Send the investor deck", "Call Bob", None, MISSING],
+    "email_subject": ["Re: Q4 deck", None, MISSING],
+}
+
+# Per filter field: values to try when that filter is active
+FILTER_VALUES = {
+    "sender_email": ["sarah", "ACME", "@"],
+    "sender_name": ["sar", "bob"],
+    "sender_role": [["investor"], ["customer", "unknown"], ["Investor"]],
+    "direction": [["incoming"], ["outgoing"], ["Outgoing", "incoming"]],
+    "assigned_to_me": [True, False],
+    "created_after": [datetime(2025, 11, 22, tzinfo=timezone.utc)],
+    "created_before": [datetime(2025, 11, 22, tzinfo=timezone.utc)],
+    "deadline_after": [TODAY],
+    "deadline_before": [TODAY, date(2025, 11, 29)],
+    "has_deadline": [True, False],
+    "priority": [["high"], ["medium", "low"], ["HIGH"]],
+    "commitment_type": [["call"], ["general", "meeting"]],
+    "search_text": ["deck", "CALL", "re:"],
+}
+
+
+def make_doc(i, rng, with_blobs):
+    doc = {"commitment_id": f"c{i}"}
+    for name, choices in DOC_VALUES.items():
+        value = rng.choice(choices)
+        if value is not MISSING:
+            doc[name] = value
+    if with_blobs:
+        # Docs saved after search blobs existed carry them; older ones don't
+        doc.update(build_search_blobs(doc))
+    return doc
+
+
+def make_docs(seed, n=200):
+    rng = random.Random(seed)
+    return [make_doc(i, rng, with_blobs=i % 2 == 0) for i in range(n)]
+
+
+def ids(commitments):
+    return [c["commitment_id"] for c in commitments]
+
+
+class CompiledPredicateTests(unittest.TestCase):
+
+    def assert_matches_reference(self, docs, filters):
+        expected = [c for c in docs if reference_passes(c, filters)]
+        actual = apply_status_independent_filters(docs, filters, TODAY)
+        self.assertEqual(ids(actual), ids(expected), filters)
+
+    def test_no_filters_returns_everything(self):
+        docs = make_docs(0)
+        self.assertEqual(ids(apply_status_independent_filters(docs, CommitmentFilters(), TODAY)), ids(docs))
+
+    def test_each_filter_alone(self):
+        docs = make_docs(1)
+        for name, values in FILTER_VALUES.items():
+            for value in values:
+                with self.subTest(filter=name, value=value):
+                    self.assert_matches_reference(docs, CommitmentFilters(**{name: value}))
+
+    def test_pairs_of_filters(self):
+        docs = make_docs(2)
+        for (a, a_values), (b, b_values) in itertools.combinations(FILTER_VALUES.items(), 2):
+            for a_value, b_value in itertools.product(a_values, b_values):
+                with self.subTest(filters=(a, a_value, b, b_value)):
+                    self.assert_matches_reference(docs, CommitmentFilters(**{a: a_value, b: b_value}))
+
+    def test_random_combinations(self):
+        rng = random.Random(3)
+        names = list(FILTER_VALUES)
+        for seed in range(300):
+            docs = make_docs(100 + seed, n=60)
+            chosen = rng.sample(names, rng.randint(1, len(names)))
+            kwargs = {name: rng.choice(FILTER_VALUES[name]) for name in chosen}
+            with self.subTest(filters=kwargs):
+                self.assert_matches_reference(docs, CommitmentFilters(**kwargs))
+
+    def test_same_shape_reuses_values_not_source(self):
+        # One compiled factory per shape: values must come from the call, not the source
+        docs = make_docs(4)
+        self.assert_matches_reference(docs, CommitmentFilters(priority=["high"]))
+        self.assert_matches_reference(docs, CommitmentFilters(priority=["low"]))
+
+
+class FirestoreClauseTests(unittest.TestCase):
+
+    def test_no_filters_no_clauses(self):
+        self.assertEqual(CommitmentFilters().to_firestore_clauses(), [])
+
+    def test_direction_only_when_it_excludes_incoming(self):
+        self.assertEqual(
+            CommitmentFilters(direction=["Outgoing"]).to_firestore_clauses(),
+            [("direction", "==", "outgoing")],
+        )
+        # Docs missing direction default to incoming, so they can't be matched server-side
+        self.assertEqual(CommitmentFilters(direction=["incoming"]).to_firestore_clauses(), [])
+        self.assertEqual(CommitmentFilters(direction=["outgoing", "incoming"]).to_firestore_clauses(), [])
+
+    def test_assigned_to_me(self):
+        self.assertEqual(
+            CommitmentFilters(assigned_to_me=False).to_firestore_clauses(),
+            [("assigned_to_me", "==", False)],
+        )
+
+    def test_has_deadline_only_when_indexed(self):
+        filters = CommitmentFilters(has_deadline=True)
+        self.assertEqual(filters.to_firestore_clauses(), [])
+        self.assertEqual(filters.to_firestore_clauses(has_deadline_indexed=True), [("has_deadline", "==", True)])
+
+    def test_deadline_range_upper_bound_is_next_day(self):
+        filters = CommitmentFilters(deadline_after=date(2025, 11, 22), deadline_before=date(2025, 11, 30))
+        self.assertEqual(filters.to_firestore_clauses(), [
+            ("deadline_iso", ">=", "2025-11-22"),
+            ("deadline_iso", "<", "2025-12-01"),
+        ])
+
+    def test_deadline_range_wins_over_created_range(self):
+        filters = CommitmentFilters(
+            deadline_before=date(2025, 11, 22),
+            created_after=datetime(2025, 11, 1, tzinfo=timezone.utc),
+        )
+        self.assertEqual(filters.to_firestore_clauses(), [("deadline_iso", "<", "2025-11-23")])
+
+    def test_created_range_only_for_tz_aware_bounds(self):
+        self.assertEqual(CommitmentFilters(created_after=datetime(2025, 11, 1)).to_firestore_clauses(), [])
+        filters = CommitmentFilters(
+            created_after=datetime(2025, 11, 1, 2, 0, tzinfo=timezone.utc),
+            created_before=datetime.fromisoformat("2025-11-02T09:00:00+05:00"),
+        )
+        self.assertEqual(filters.to_firestore_clauses(), [
+            ("created_at", ">=", "2025-11-01T02:00:00+00:00"),
+            ("created_at", "<=", "2025-11-02T04:00:00+00:00"),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
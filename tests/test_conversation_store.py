@@ -0,0 +1,153 @@
+"""
+Redis history cache tests for ConversationStore.
+
+Uses an in-memory stand-in for the Upstash client and overrides the
+Firestore read, so no network access is needed.
+
+Run: python -m unittest tests.test_conversation_store
+"""
+
+import unittest
+
+import orjson
+
+from services.chat.conversation_store import Conversation, ConversationStore
+
+
+class InMemoryRedis:
+    """The list commands ConversationStore uses, on a dict of lists."""
+
+    def __init__(self):
+        self.lists = {}
+        self.ttls = {}
+
+    def _run(self, command):
+        name, key, *args = command
+        if name == "DEL":
+            self.ttls.pop(key, None)
+            return int(self.lists.pop(key, None) is not None)
+        if name in ("RPUSH", "RPUSHX"):
+            if name == "RPUSHX" and key not in self.lists:
+                return 0
+            self.lists.setdefault(key, []).extend(args)
+            return len(self.lists[key])
+        if name == "LTRIM":
+            start, stop = int(args[0]), int(args[1])
+            items = self.lists.get(key, [])
+            stop = len(items) if stop == -1 else stop + 1
+            self.lists[key] = items[start:stop]
+            return "OK"
+        if name == "EXPIRE":
+            if key not in self.lists:
+                return 0
+            self.ttls[key] = int(args[0])
+            return 1
+        raise AssertionError(f"unexpected command {name}")
+
+    def multi_exec(self, commands):
+        return [self._run(command) for command in commands]
+
+    def lrange(self, key, start, stop):
+        items = self.lists.get(key, [])
+        stop = len(items) if stop == -1 else stop + 1
+        return items[start:stop]
+
+
+class StoreWithoutFirestore(ConversationStore):
+    """ConversationStore whose Firestore history read is a fixed message list."""
+
+    def __init__(self, firestore_messages=()):
+        self.redis = InMemoryRedis()
+        self.firestore_messages = list(firestore_messages)
+        self.firestore_reads = 0
+
+    def _stream_message_dicts(self, user_id, chat_page_id, limit=None):
+        self.firestore_reads += 1
+        return iter(self.firestore_messages)
+
+
+def exchange(n):
+    return Conversation(
+        conversation_id=f"conv_{n}",
+        user_message=f"question {n}",
+        assistant_message=f"answer {n}",
+        timestamp=f"2025-11-22T10:00:{n:02d}Z",
+    )
+
+
+def message(role, n):
+    return {"role": role, "content": f"{'question' if role == 'user' else 'answer'} {n}", "timestamp": f"2025-11-22T10:00:{n:02d}Z"}
+
+
+class HistoryCacheTests(unittest.TestCase):
+
+    def cached(self, store):
+        key = store._cache_key("u1", "chat1")
+        return [orjson.loads(m) for m in store.redis.lists.get(key, [])]
+
+    def test_append_to_warm_cache_pushes_both_messages(self):
+        store = StoreWithoutFirestore()
+        store._set_cache("u1", "chat1", [message("user", 0), message("assistant", 0)])
+
+        store._append_to_cache("u1", "chat1", exchange(1))
+
+        self.assertEqual([m["content"] for m in self.cached(store)], ["question 0", "answer 0", "question 1", "answer 1"])
+        self.assertEqual(store.firestore_reads, 0)
+        self.assertEqual(store.redis.ttls[store._cache_key("u1", "chat1")], store.CACHE_TTL)
+
+    def test_append_trims_to_max_history(self):
+        store = StoreWithoutFirestore()
+        store._set_cache("u1", "chat1", [message("user", 0), message("assistant", 0)])
+
+        for n in range(1, store.MAX_HISTORY_MESSAGES):
+            store._append_to_cache("u1", "chat1", exchange(n))
+
+        cached = self.cached(store)
+        self.assertEqual(len(cached), store.MAX_HISTORY_MESSAGES)
+        self.assertEqual(cached[-1]["content"], f"answer {store.MAX_HISTORY_MESSAGES - 1}")
+        self.assertEqual(cached[0]["role"], "user")
+
+    def test_interleaved_appends_keep_every_exchange(self):
+        store = StoreWithoutFirestore()
+        store._set_cache("u1", "chat1", [message("user", 0), message("assistant", 0)])
+
+        # Two requests on the same chat page, neither reading the list first
+        store._append_to_cache("u1", "chat1", exchange(1))
+        store._append_to_cache("u1", "chat1", exchange(2))
+
+        self.assertEqual(len(self.cached(store)), 6)
+
+    def test_cache_miss_rebuilds_from_firestore(self):
+        history = [message("user", 0), message("assistant", 0), message("user", 1), message("assistant", 1)]
+        store = StoreWithoutFirestore(firestore_messages=history)
+
+        store._append_to_cache("u1", "chat1", exchange(1))
+
+        self.assertEqual(store.firestore_reads, 1)
+        self.assertEqual(self.cached(store), history)
+
+    def test_long_content_is_truncated_in_cache(self):
+        store = StoreWithoutFirestore()
+        store._set_cache("u1", "chat1", [message("user", 0)])
+        long_answer = "x" * (store.MAX_CACHED_CONTENT_CHARS + 10)
+
+        store._append_to_cache("u1", "chat1", Conversation(
+            conversation_id="conv_1", user_message="q", assistant_message=long_answer, timestamp="t",
+        ))
+
+        last = self.cached(store)[-1]
+        self.assertEqual(len(last["content"]), store.MAX_CACHED_CONTENT_CHARS)
+        self.assertTrue(last["truncated"])
+
+    def test_message_history_reads_the_list(self):
+        store = StoreWithoutFirestore()
+        store._set_cache("u1", "chat1", [message("user", 0), message("assistant", 0)])
+
+        history = store.get_message_history("u1", "chat1")
+
+        self.assertEqual([m.content for m in history], ["question 0", "answer 0"])
+        self.assertEqual(store.firestore_reads, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()